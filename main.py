@@ -1,40 +1,66 @@
-from fastapi import FastAPI, Request, BackgroundTasks
+from fastapi import FastAPI, Request, BackgroundTasks, __version__ as FASTAPI_VERSION
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse, StreamingResponse
+from fastapi.responses import FileResponse, StreamingResponse, Response
 import asyncio
-from pydantic import BaseModel
-from openai import OpenAI
+from pydantic import BaseModel, TypeAdapter
+from openai import AsyncOpenAI, APIError, APITimeoutError
 from dotenv import load_dotenv
 import os
 import logging
+import logging.handlers
+import queue
+import atexit
 import time
 import uuid
-from datetime import datetime, timezone, timedelta
+from datetime import date, datetime, timezone, timedelta
 from zoneinfo import ZoneInfo
-import json
+import copy
+import html
+import orjson
 import sys
+import tempfile
 import httpx
 from bs4 import BeautifulSoup
 import re
 import yfinance as yf
 import smtplib
 from email.message import EmailMessage
+from apscheduler.events import EVENT_JOB_MAX_INSTANCES, EVENT_JOB_MISSED
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.date import DateTrigger
 
+from stock_utils import download_closes
+
 load_dotenv()
 
 # Configure logging with more detailed format
-logging.basicConfig(
-    level=logging.DEBUG,  # Changed to DEBUG for more verbose logging
-    format='%(asctime)s - %(name)s - %(levelname)s - [%(request_id)s] - %(funcName)s:%(lineno)d - %(message)s',
+log_formatter = logging.Formatter(
+    '%(asctime)s - %(name)s - %(levelname)s - [%(request_id)s] - %(funcName)s:%(lineno)d - %(message)s',
     datefmt='%Y-%m-%d %H:%M:%S',
-    handlers=[
-        logging.StreamHandler(sys.stdout),
-        logging.FileHandler('app.log', mode='a')  # Also log to file
-    ]
 )
+log_handlers = [
+    logging.StreamHandler(sys.stdout),
+    logging.FileHandler('app.log', mode='a', delay=True)  # Also log to file (opened on first record)
+]
+for handler in log_handlers:
+    handler.setFormatter(log_formatter)
+
+# Loggers only enqueue records; a background listener thread does the stdout/file
+# writes, so logging never blocks the event loop on I/O
+log_queue = queue.SimpleQueue()
+queue_handler = logging.handlers.QueueHandler(log_queue)
+# Bare message only: the listener's handlers apply the full format
+queue_handler.setFormatter(logging.Formatter('%(message)s'))
+logging.basicConfig(
+    # INFO by default so debug-only details aren't built; LOG_LEVEL=DEBUG opts in to verbose logging
+    level=os.getenv("LOG_LEVEL", "INFO").upper(),
+    handlers=[queue_handler]
+)
+log_listener = logging.handlers.QueueListener(log_queue, *log_handlers)
+log_listener.start()
+# Flush queued records on interpreter exit (after the shutdown event has logged)
+atexit.register(log_listener.stop)
 
 # Create a custom filter to add request_id to log records
 class RequestIdFilter(logging.Filter):
@@ -54,31 +80,57 @@ for handler in root_logger.handlers:
 
 logger = logging.getLogger(__name__)
 
+# Separator lines for log banners (scheduled tasks use the short one, startup/shutdown the wide one)
+BANNER = "=" * 60
+BANNER_WIDE = "=" * 80
+
 app = FastAPI()
 
-# Global scheduler for scheduled tasks
-scheduler = AsyncIOScheduler()
+# Global scheduler for scheduled tasks. A late chain (busy event loop, slow
+# restart) still runs within the 5-minute grace period instead of the 1-second
+# default, and never overlaps a run that is still in progress
+scheduler = AsyncIOScheduler(job_defaults={
+    "coalesce": True,
+    "max_instances": 1,
+    "misfire_grace_time": 300,
+})
+
+
+def _log_skipped_job(event) -> None:
+    """Scheduler listener: warn when a job run is dropped instead of failing silently."""
+    if event.code == EVENT_JOB_MISSED:
+        logger.warning("Scheduled job '%s' missed its run time %s (past the misfire grace period)", event.job_id, event.scheduled_run_time)
+    else:
+        logger.warning("Scheduled job '%s' skipped: previous run still in progress", event.job_id)
+
+
+scheduler.add_listener(_log_skipped_job, EVENT_JOB_MISSED | EVENT_JOB_MAX_INSTANCES)
 
 # SSE (Server-Sent Events) client management
 sse_clients: set[asyncio.Queue] = set()
+# Per-client backlog limit; a client this far behind is dropped instead of buffering forever
+SSE_QUEUE_MAXSIZE = 64
+# Fixed SSE frames, pre-encoded; queues and the stream carry bytes end to end
+SSE_CONNECTED_FRAME = b'event: connected\ndata: {"status": "connected"}\n\n'
+SSE_KEEPALIVE_FRAME = b": keepalive\n\n"
 
 async def broadcast_sse_event(event_type: str, data: dict = None):
     """Broadcast an event to all connected SSE clients."""
-    import json
-    event_data = json.dumps({"type": event_type, "data": data or {}})
-    message = f"event: {event_type}\ndata: {event_data}\n\n"
+    event_data = orjson.dumps({"type": event_type, "data": data or {}})
+    message = b"event: " + event_type.encode() + b"\ndata: " + event_data + b"\n\n"
 
-    # Send to all connected clients
+    # Non-blocking fan-out: a client whose queue is full has stopped reading, so drop it
     disconnected = set()
     for client_queue in sse_clients:
         try:
-            await client_queue.put(message)
-        except Exception:
+            client_queue.put_nowait(message)
+        except asyncio.QueueFull:
             disconnected.add(client_queue)
 
-    # Clean up disconnected clients
-    for client_queue in disconnected:
-        sse_clients.discard(client_queue)
+    # Clean up slow/disconnected clients
+    if disconnected:
+        sse_clients.difference_update(disconnected)
+        logger.warning(f"Dropped {len(disconnected)} SSE clients with a full queue")
 
     logger.info(f"Broadcast SSE event '{event_type}' to {len(sse_clients)} clients")
 
@@ -96,13 +148,116 @@ app.add_middleware(
 
 # Use SUPER_MIND_API_KEY or fall back to AI_BUILDER_TOKEN (injected by platform)
 api_key = os.getenv("SUPER_MIND_API_KEY") or os.getenv("AI_BUILDER_TOKEN")
-client = OpenAI(
+# Async client so LLM calls don't block the event loop; the keep-alive pool lets
+# back-to-back calls reuse TLS connections instead of handshaking every time
+client = AsyncOpenAI(
     api_key=api_key,
-    base_url="https://space.ai-builders.com/backend/v1"
+    base_url="https://space.ai-builders.com/backend/v1",
+    http_client=httpx.AsyncClient(
+        timeout=httpx.Timeout(60.0),
+        limits=httpx.Limits(max_keepalive_connections=10),
+    ),
 )
 
+# Atomic JSON write helper
+def _write_json_atomic(path: str, data, indent: bool = True) -> None:
+    """Write data to a JSON file atomically.
+
+    Serializes with orjson (2-space indent unless indent=False, trailing
+    newline) into a temp file in the same directory, fsyncs it, then swaps it
+    into place with os.replace so a crash mid-write never leaves a truncated
+    file behind. If the path is read through _read_json_cached(), the cache
+    entry is refreshed with `data` so the next read doesn't re-parse the file;
+    don't mutate `data` after writing it.
+    """
+    option = orjson.OPT_APPEND_NEWLINE | (orjson.OPT_INDENT_2 if indent else 0)
+    payload = orjson.dumps(data, option=option)
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(path)}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    if path in _json_cache:
+        st = os.stat(path)
+        _json_cache[path] = ((st.st_mtime_ns, st.st_size), data)
+
+# Cached JSON read helper: (mtime_ns, size) and parsed data per path
+_json_cache: dict[str, tuple[tuple[int, int], object]] = {}
+
+def _read_json_cached(path: str):
+    """Return the parsed contents of a JSON file, re-parsing only when it changes.
+
+    The cache is keyed on the file's mtime and size, so repeated reads of an
+    unchanged file cost a single os.stat(). The returned object is shared -
+    copy it before mutating.
+    """
+    st = os.stat(path)
+    key = (st.st_mtime_ns, st.st_size)
+    cached = _json_cache.get(path)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+    with open(path, "rb") as f:
+        data = orjson.loads(f.read())
+    _json_cache[path] = (key, data)
+    return data
+
+
+def _read_json_fresh(path: str):
+    """Parse a JSON file straight from disk, bypassing the cache (for read-modify-write)."""
+    with open(path, "rb") as f:
+        return orjson.loads(f.read())
+
+
+def _load_email_config() -> dict:
+    """Load email.json (recipients, subject, newsSearch, content) via the mtime cache."""
+    return _read_json_cached("email.json")
+
+
+def _load_stock_data() -> dict:
+    """Load stockapp.json via the mtime cache.
+
+    Returns a new top-level dict and a new "stocks" list, so callers can
+    reassign keys and filter/reorder the list freely. The stock dicts inside
+    are shared with the cache - copy one before changing it.
+    """
+    data = _read_json_cached("stockapp.json")
+    return {**data, "stocks": list(data.get("stocks", []))}
+
+
+# Serializes stockapp.json saves; asyncio.Lock wakes waiters in FIFO order, so
+# saves land in the order they were requested even though they run in threads
+_stock_write_lock = asyncio.Lock()
+
+
+async def _save_stock_data(data: dict) -> None:
+    """Write stockapp.json atomically in a worker thread so the event loop isn't blocked on fsync."""
+    async with _stock_write_lock:
+        await asyncio.to_thread(_write_json_atomic, "stockapp.json", data)
+
+
+async def _update_stock_data(mutate):
+    """Read-modify-write stockapp.json under _stock_write_lock.
+
+    `mutate` receives the data from _load_stock_data() and edits it in place.
+    Holding the lock across the read and the write means a concurrent save
+    can't land in between and be overwritten by stale data. Returns what
+    `mutate` returns; if that is None, nothing is written.
+    """
+    async with _stock_write_lock:
+        data = _load_stock_data()
+        result = mutate(data)
+        if result is not None:
+            await asyncio.to_thread(_write_json_atomic, "stockapp.json", data)
+        return result
+
 # Web search function
-def web_search(query: str) -> dict:
+async def web_search(query: str) -> dict:
     """
     Call the internal search API to search the web.
 
@@ -123,16 +278,20 @@ def web_search(query: str) -> dict:
     }
 
     try:
-        with httpx.Client() as http_client:
-            response = http_client.post(url, json=payload, headers=headers, timeout=30.0)
-            response.raise_for_status()
-            return response.json()
+        response = await app.state.http_client.post(url, json=payload, headers=headers, timeout=30.0)
+        response.raise_for_status()
+        return orjson.loads(response.content)
     except Exception as e:
         logger.error(f"Error calling web search API: {e}")
         return {"error": str(e)}
 
+WHITESPACE_RE = re.compile(r'\s+')
+# read_page stops downloading after this much HTML; still far more than the
+# 10000 chars of text it keeps, without parsing multi-MB pages in full
+READ_PAGE_MAX_BYTES = 256 * 1024
+
 # Read page function
-def read_page(url: str) -> dict:
+async def read_page(url: str) -> dict:
     """
     Fetch a URL and extract the main text content from the HTML.
     Strips HTML tags, scripts, and styles to return clean text.
@@ -144,44 +303,53 @@ def read_page(url: str) -> dict:
         dict: Contains the extracted text or error message
     """
     try:
-        with httpx.Client() as http_client:
-            # Fetch the URL with a timeout
-            response = http_client.get(url, timeout=30.0, follow_redirects=True)
+        # Stream the URL over the shared keep-alive client, keeping at most READ_PAGE_MAX_BYTES
+        content = bytearray()
+        async with app.state.http_client.stream("GET", url, timeout=30.0, follow_redirects=True) as response:
             response.raise_for_status()
+            async for chunk in response.aiter_bytes():
+                content += chunk
+                if len(content) >= READ_PAGE_MAX_BYTES:
+                    break
 
-            # Parse HTML with BeautifulSoup
-            soup = BeautifulSoup(response.text, 'html.parser')
-
-            # Remove script and style elements
-            for script in soup(['script', 'style', 'noscript']):
-                script.decompose()
+        # Parse HTML with BeautifulSoup (lxml is the C-backed parser; it sniffs the encoding from the raw bytes)
+        soup = BeautifulSoup(bytes(content[:READ_PAGE_MAX_BYTES]), 'lxml')
 
-            # Get text content
-            text = soup.get_text()
+        # Remove script and style elements
+        for script in soup(['script', 'style', 'noscript']):
+            script.decompose()
 
-            # Clean up the text: remove extra whitespace
-            lines = (line.strip() for line in text.splitlines())
-            chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-            text = ' '.join(chunk for chunk in chunks if chunk)
+        # Get text content (space between tags) and collapse all whitespace runs in one pass
+        text = WHITESPACE_RE.sub(' ', soup.get_text(separator=' ')).strip()
 
-            # Limit text length to avoid overwhelming the LLM (max 10000 chars)
-            if len(text) > 10000:
-                text = text[:10000] + "... (truncated)"
+        # Limit text length to avoid overwhelming the LLM (max 10000 chars)
+        if len(text) > 10000:
+            text = text[:10000] + "... (truncated)"
 
-            logger.info(f"Successfully fetched and parsed {url} - Text length: {len(text)} chars")
+        logger.info(f"Successfully fetched and parsed {url} - Text length: {len(text)} chars")
 
-            return {
-                "url": url,
-                "text": text,
-                "length": len(text)
-            }
+        return {
+            "url": url,
+            "text": text,
+            "length": len(text)
+        }
 
     except Exception as e:
         logger.error(f"Error reading page {url}: {e}")
         return {"error": str(e), "url": url}
 
 
-def summarize_page_content(url: str, text: str, symbol: str, name: str) -> str:
+# Prompt template for summarize_page_content, filled per page with str.format_map
+SUMMARY_PROMPT_TEMPLATE = """Summarize the following article content in 2-3 concise sentences, focusing on information relevant to {symbol} ({name}) stock. Extract the key news points that could explain stock price movement.
+
+Article from: {url}
+
+Content:
+{text}
+
+Provide only the summary, no additional commentary."""
+
+async def summarize_page_content(url: str, text: str, symbol: str, name: str) -> str:
     """
     Summarize the page content using LLM to extract key news information.
 
@@ -195,18 +363,16 @@ def summarize_page_content(url: str, text: str, symbol: str, name: str) -> str:
         str: Summarized content focusing on news relevant to the stock
     """
     try:
-        summary_prompt = f"""Summarize the following article content in 2-3 concise sentences, focusing on information relevant to {symbol} ({name}) stock. Extract the key news points that could explain stock price movement.
-
-Article from: {url}
-
-Content:
-{text[:5000]}
-
-Provide only the summary, no additional commentary."""
+        summary_prompt = SUMMARY_PROMPT_TEMPLATE.format_map({
+            "symbol": symbol,
+            "name": name,
+            "url": url,
+            "text": text[:5000],
+        })
 
         logger.info(f"[summarize_page_content] Summarizing content for {symbol} from {url}")
 
-        summary_response = client.chat.completions.create(
+        summary_response = await client.chat.completions.create(
             model="supermind-agent-v1",
             messages=[{"role": "user", "content": summary_prompt}]
         )
@@ -273,6 +439,9 @@ class StockUpdate(BaseModel):
 class StocksUpdateRequest(BaseModel):
     stocks: list[StockUpdate]
 
+# Dumps a whole validated stock list in one pydantic-core call instead of N model_dump()s
+STOCK_LIST_ADAPTER = TypeAdapter(list[StockUpdate])
+
 class ScheduleRequest(BaseModel):
     trigger_time: str  # ISO 8601 format, e.g., "2026-01-23T07:00:00+08:00"
 
@@ -286,20 +455,53 @@ async def root():
 
 @app.get("/api/stocks")
 async def get_stocks():
-    with open("stockapp.json", "r") as f:
-        data = json.load(f)
+    data = _read_json_cached("stockapp.json")
     return {"stocks": data["stocks"]}
 
+TITLE_RE = re.compile(r'<title[^>]*>([^<]+)</title>', re.IGNORECASE)
+
+# Successful company-name lookups per (search source, symbol): (time.monotonic() when fetched, result)
+STOCK_INFO_TTL_SECONDS = 3600
+_stock_info_cache: dict[tuple[str, str], tuple[float, dict]] = {}
+
+# Company names from yfinance per symbol. Ticker.info pulls the whole quoteSummary
+# payload just for longName/shortName, and names practically never change, so
+# each symbol pays for it once per process
+_yf_name_cache: dict[str, str] = {}
+
+
+def _yf_company_name(ticker: yf.Ticker) -> str:
+    """Return the ticker's longName/shortName, fetching Ticker.info only on a cache miss.
+
+    Falls back to the symbol itself, which is not cached so a later call can retry.
+    """
+    symbol = ticker.ticker
+    name = _yf_name_cache.get(symbol)
+    if name is None:
+        info = ticker.info
+        name = info.get("longName") or info.get("shortName") or symbol
+        if name != symbol:
+            _yf_name_cache[symbol] = name
+    return name
+
+
 @app.get("/api/stock-info/{symbol}")
 async def get_stock_info(symbol: str):
-    """Fetch company name based on stock symbol using the configured search source."""
+    """Fetch company name based on stock symbol using the configured search source.
+
+    Successful lookups are cached for STOCK_INFO_TTL_SECONDS; errors are not cached.
+    """
     symbol = symbol.upper().strip()
 
     # Read the search source from stockapp.json
-    with open("stockapp.json", "r") as f:
-        config = json.load(f)
+    config = _read_json_cached("stockapp.json")
     search_source = config.get("search", "google finance").lower()
 
+    cache_key = (search_source, symbol)
+    cached = _stock_info_cache.get(cache_key)
+    if cached and time.monotonic() - cached[0] < STOCK_INFO_TTL_SECONDS:
+        return cached[1]
+
     headers = {
         "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
         "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
@@ -307,37 +509,43 @@ async def get_stock_info(symbol: str):
     }
 
     try:
-        with httpx.Client() as http_client:
-            if "google" in search_source:
-                # Try multiple exchanges for Google Finance
-                exchanges = ["NASDAQ", "NYSE", "NYSEARCA", "BATS", "MUTF"]
-                for exchange in exchanges:
-                    url = f"https://www.google.com/finance/quote/{symbol}:{exchange}"
-                    response = http_client.get(url, timeout=10.0, follow_redirects=True, headers=headers)
-
-                    if response.status_code == 200:
-                        soup = BeautifulSoup(response.text, 'html.parser')
-                        title = soup.find('title')
-                        if title:
-                            title_text = title.get_text()
-                            # Title format: "Company Name (SYMBOL) Price & News - Google Finance"
-                            if '(' in title_text and symbol in title_text:
-                                company_name = title_text.split('(')[0].strip()
-                                return {"symbol": symbol, "name": company_name, "source": "google finance"}
-
-                return {"symbol": symbol, "name": symbol, "error": "Could not find on Google Finance"}
-
-            else:
-                # Use yfinance for Yahoo Finance
-                pass  # Exit the httpx client context, use yfinance below
+        if "google" in search_source:
+            # Try multiple exchanges for Google Finance over the shared keep-alive client.
+            # All exchanges are requested at once; results are checked in list order.
+            http_client = app.state.http_client
+            exchanges = ["NASDAQ", "NYSE", "NYSEARCA", "BATS", "MUTF"]
+            responses = await asyncio.gather(
+                *(http_client.get(f"https://www.google.com/finance/quote/{symbol}:{exchange}",
+                                  timeout=10.0, follow_redirects=True, headers=headers)
+                  for exchange in exchanges),
+                return_exceptions=True
+            )
+            for exchange, response in zip(exchanges, responses):
+                if isinstance(response, Exception):
+                    logger.warning(f"Google Finance request failed for {symbol}:{exchange}: {response}")
+                    continue
+
+                if response.is_success:
+                    # Only the <title> is needed, so pull it out with a regex instead of parsing the page
+                    title = TITLE_RE.search(response.text)
+                    if title:
+                        title_text = html.unescape(title.group(1))
+                        # Title format: "Company Name (SYMBOL) Price & News - Google Finance"
+                        if '(' in title_text and symbol in title_text:
+                            company_name = title_text.split('(')[0].strip()
+                            result = {"symbol": symbol, "name": company_name, "source": "google finance"}
+                            _stock_info_cache[cache_key] = (time.monotonic(), result)
+                            return result
+
+            return {"symbol": symbol, "name": symbol, "error": "Could not find on Google Finance"}
 
         # Use yfinance library for Yahoo Finance
         if "yahoo" in search_source:
             try:
-                ticker = yf.Ticker(symbol)
-                info = ticker.info
-                company_name = info.get("longName") or info.get("shortName") or symbol
-                return {"symbol": symbol, "name": company_name, "source": "yahoo finance (yfinance)"}
+                company_name = _yf_company_name(yf.Ticker(symbol))
+                result = {"symbol": symbol, "name": company_name, "source": "yahoo finance (yfinance)"}
+                _stock_info_cache[cache_key] = (time.monotonic(), result)
+                return result
             except Exception as yf_error:
                 logger.error(f"yfinance error for {symbol}: {yf_error}")
                 return {"symbol": symbol, "name": symbol, "error": f"Could not find on Yahoo Finance: {yf_error}"}
@@ -347,6 +555,13 @@ async def get_stock_info(symbol: str):
         return {"symbol": symbol, "name": symbol, "error": str(e)}
 
 
+# Taiwan Time: stock price dates and schedule trigger times are all expressed in this zone
+TAIPEI_TZ = ZoneInfo("Asia/Taipei")
+# US market close (4:00 PM Eastern) is 5:00 AM the next day in Taiwan
+MARKET_CLOSE_HOUR_TAIPEI = 5
+ONE_DAY = timedelta(days=1)
+
+
 def format_market_close_time(trading_date) -> str:
     """Convert trading date to market close time in Taiwan Time.
 
@@ -362,142 +577,212 @@ def format_market_close_time(trading_date) -> str:
     trade_date = trading_date.date() if hasattr(trading_date, 'date') else trading_date
 
     # Market closes at 4:00 PM Eastern Time = 5:00 AM next day Taiwan Time
-    taiwan = ZoneInfo("Asia/Taipei")
     # Add one day to get the next day, set time to 5:00 AM
-    next_day = trade_date + timedelta(days=1)
-    market_close = datetime(next_day.year, next_day.month, next_day.day, 5, 0, 0, tzinfo=taiwan)
+    next_day = trade_date + ONE_DAY
+    market_close = datetime(next_day.year, next_day.month, next_day.day, MARKET_CLOSE_HOUR_TAIPEI, 0, 0, tzinfo=TAIPEI_TZ)
 
     # Format as ISO 8601 with timezone offset
     return market_close.isoformat()
 
 
-@app.put("/api/stocks")
-async def update_stocks(request: StocksUpdateRequest):
-    """Update stocks - saves symbol/buyPrice first, then fetches prices from yfinance.
+# Max yfinance lookups in flight at once (each runs in a worker thread)
+YFINANCE_MAX_CONCURRENCY = 8
+
+
+def _fetch_stock_quote(stock_dict: dict, symbol: str, close=None) -> bool:
+    """Fill name, financialStatementsDate, price, date and changePercent from yfinance.
 
-    Two-phase save approach:
-    1. Save symbol/buyPrice to stockapp.json FIRST (preserves user edits even if yfinance fails)
-    2. Fetch prices from yfinance
-    3. Final save with updated prices
+    Blocking (several HTTP round-trips per symbol), so callers run it in a
+    worker thread via _fetch_stock_quotes(). `close` is the symbol's Close
+    series from download_closes(); without it the 2-day history is fetched
+    here.
+
+    Returns:
+        bool: True if a closing price was found and stored
     """
-    # Read existing data to preserve the search field and _metadata
-    with open("stockapp.json", "r") as f:
-        existing_data = json.load(f)
-
-    existing_stocks = existing_data.get("stocks", [])
-
-    # STEP 1: Save symbol/buyPrice FIRST (before yfinance calls)
-    # This ensures user edits are persisted even if yfinance fails
-    preliminary_stocks = []
-    for i, stock in enumerate(request.stocks):
-        stock_dict = stock.model_dump()
-        symbol = stock.symbol.upper().strip()
-        stock_dict["symbol"] = symbol
-
-        # Preserve existing price data if symbol unchanged
-        if i < len(existing_stocks) and existing_stocks[i].get("symbol", "").upper() == symbol:
-            stock_dict["price"] = existing_stocks[i].get("price", 0)
-            stock_dict["changePercent"] = existing_stocks[i].get("changePercent", 0)
-            stock_dict["date"] = existing_stocks[i].get("date", "")
-            stock_dict["name"] = existing_stocks[i].get("name", symbol)
-            stock_dict["diff"] = existing_stocks[i].get("diff", 0)
+    logger.info(f"Fetching fresh data for {symbol}")
+    try:
+        ticker = yf.Ticker(symbol)
+        stock_dict["name"] = _yf_company_name(ticker)
+
+        # Get next earnings/financial statements date (only future dates)
+        try:
+            calendar = ticker.calendar
+            earnings_dates = calendar.get('Earnings Date', []) if calendar else []
+            today = datetime.now().date()
+            # Filter to only future dates
+            future_dates = []
+            for ed in earnings_dates:
+                if hasattr(ed, 'date'):
+                    ed_date = ed.date()
+                else:
+                    ed_date = ed
+                if ed_date >= today:
+                    future_dates.append(ed)
+            if future_dates:
+                next_earnings = future_dates[0]
+                if hasattr(next_earnings, 'isoformat'):
+                    stock_dict["financialStatementsDate"] = next_earnings.isoformat()
+                else:
+                    stock_dict["financialStatementsDate"] = str(next_earnings)
+            else:
+                stock_dict["financialStatementsDate"] = None
+        except Exception as cal_error:
+            logger.warning(f"Could not get earnings date for {symbol}: {cal_error}")
+            stock_dict["financialStatementsDate"] = None
+
+        # Get last closed price and calculate percentage change
+        if close is None:
+            close = ticker.history(period="2d")['Close'].dropna()
+        if close.empty:
+            return False
+        stock_dict["price"] = round(float(close.iloc[-1]), 2)
+        # Get the actual market close time in +08:00 timezone
+        trading_date = close.index[-1]
+        price_date = format_market_close_time(trading_date)
+        stock_dict["date"] = price_date
+
+        # Calculate percentage change from previous day
+        if len(close) >= 2:
+            current_close = float(close.iloc[-1])
+            previous_close = float(close.iloc[-2])
+            change_percent = ((current_close - previous_close) / previous_close) * 100
+            stock_dict["changePercent"] = round(change_percent, 2)
         else:
-            # Symbol changed or new stock - set defaults
-            stock_dict["price"] = stock_dict.get("price", 0)
-            stock_dict["changePercent"] = stock_dict.get("changePercent", 0)
-            stock_dict["date"] = stock_dict.get("date", "")
-            stock_dict["name"] = stock_dict.get("name", symbol)
-            stock_dict["diff"] = stock_dict.get("diff", 0)
-
-        preliminary_stocks.append(stock_dict)
-
-    # Write preliminary save (symbol/buyPrice persisted)
-    existing_data["stocks"] = preliminary_stocks
-    with open("stockapp.json", "w") as f:
-        json.dump(existing_data, f, indent=2)
-    logger.info(f"Preliminary save completed: {len(preliminary_stocks)} stocks saved to stockapp.json")
-
-    # STEP 2: Fetch yfinance data for each stock
-    updated_stocks = []
-    for stock_dict in preliminary_stocks:
-        symbol = stock_dict["symbol"]
-
-        # Fetch fresh prices for stocks with valid symbols
-        if symbol:
-            logger.info(f"Fetching fresh data for {symbol}")
-            try:
-                ticker = yf.Ticker(symbol)
-                info = ticker.info
-                stock_dict["name"] = info.get("longName") or info.get("shortName") or symbol
+            stock_dict["changePercent"] = None
 
-                # Get next earnings/financial statements date (only future dates)
-                try:
-                    calendar = ticker.calendar
-                    earnings_dates = calendar.get('Earnings Date', []) if calendar else []
-                    today = datetime.now().date()
-                    # Filter to only future dates
-                    future_dates = []
-                    for ed in earnings_dates:
-                        if hasattr(ed, 'date'):
-                            ed_date = ed.date()
-                        else:
-                            ed_date = ed
-                        if ed_date >= today:
-                            future_dates.append(ed)
-                    if future_dates:
-                        next_earnings = future_dates[0]
-                        if hasattr(next_earnings, 'isoformat'):
-                            stock_dict["financialStatementsDate"] = next_earnings.isoformat()
-                        else:
-                            stock_dict["financialStatementsDate"] = str(next_earnings)
-                    else:
-                        stock_dict["financialStatementsDate"] = None
-                except Exception as cal_error:
-                    logger.warning(f"Could not get earnings date for {symbol}: {cal_error}")
-                    stock_dict["financialStatementsDate"] = None
-
-                # Get last closed price and calculate percentage change
-                history = ticker.history(period="2d")
-                if not history.empty:
-                    stock_dict["price"] = round(float(history['Close'].iloc[-1]), 2)
-                    # Get the actual market close time in +08:00 timezone
-                    trading_date = history.index[-1]
-                    price_date = format_market_close_time(trading_date)
-                    stock_dict["date"] = price_date
-
-                    # Calculate percentage change from previous day
-                    if len(history) >= 2:
-                        current_close = float(history['Close'].iloc[-1])
-                        previous_close = float(history['Close'].iloc[-2])
-                        change_percent = ((current_close - previous_close) / previous_close) * 100
-                        stock_dict["changePercent"] = round(change_percent, 2)
-                    else:
-                        stock_dict["changePercent"] = None
-
-                    logger.info(f"Fetched price for {symbol}: {stock_dict['price']} (date: {price_date}, change: {stock_dict.get('changePercent')}%)")
-            except Exception as e:
-                logger.error(f"yfinance error for {symbol}: {e}")
+        logger.info(f"Fetched price for {symbol}: {stock_dict['price']} (date: {price_date}, change: {stock_dict.get('changePercent')}%)")
+        return True
+    except Exception as e:
+        logger.error(f"yfinance error for {symbol}: {e}")
+        return False
+
+
+async def _fetch_stock_quotes(targets: list[tuple[dict, str]]) -> list[bool]:
+    """Run _fetch_stock_quote for each (stock_dict, symbol) pair concurrently.
+
+    Closing prices for every symbol come from a single batched download; the
+    per-symbol info/calendar lookups then run in worker threads, at most
+    YFINANCE_MAX_CONCURRENCY at a time, so wall time no longer grows linearly
+    with the number of stocks.
+    """
+    if not targets:
+        return []
+    closes = await asyncio.to_thread(download_closes, list(dict.fromkeys(symbol for _, symbol in targets)))
+    semaphore = asyncio.Semaphore(YFINANCE_MAX_CONCURRENCY)
 
-        # Always calculate diff: percentage difference from buy price (negative = above buy price)
-        price = stock_dict.get("price", 0)
-        buy_price = stock_dict.get("buyPrice", 0)
+    async def fetch(stock_dict: dict, symbol: str) -> bool:
+        async with semaphore:
+            return await asyncio.to_thread(_fetch_stock_quote, stock_dict, symbol, closes.get(symbol))
 
-        # If buyPrice is 0 (user didn't input any value), default to price * 0.9
-        if buy_price == 0 and price > 0:
-            buy_price = round(price * 0.9, 2)
-            stock_dict["buyPrice"] = buy_price
-            logger.info(f"Set default buyPrice for {symbol}: {buy_price} (90% of price {price})")
+    return await asyncio.gather(*(fetch(stock_dict, symbol) for stock_dict, symbol in targets))
 
-        if price > 0:
-            diff = round(((buy_price - price) / price) * 100, 2)
-            stock_dict["diff"] = diff
 
-        updated_stocks.append(stock_dict)
+# Fields _fetch_stock_quote() fills in from yfinance
+STOCK_QUOTE_FIELDS = ("name", "financialStatementsDate", "price", "date", "changePercent")
+
+
+@app.put("/api/stocks")
+async def update_stocks(request: StocksUpdateRequest):
+    """Update stocks - applies symbol/buyPrice edits, then fetches prices from yfinance.
+
+    Single-write approach:
+    1. Fetch prices from yfinance for the requested symbols, into copies
+    2. Under the stockapp.json lock, apply the symbol/buyPrice edits to the
+       current file contents and merge in the fetched prices
+    3. One save with edits and updated prices (if the fetch is interrupted,
+       the edits alone are saved before re-raising)
+    """
+    requested_stocks = STOCK_LIST_ADAPTER.dump_python(request.stocks)
+    # Symbol/buyPrice per row as of this request, to tell its edits from saves made during the fetch
+    base_rows = [(s.get("symbol", "").upper().strip(), s.get("buyPrice")) for s in _load_stock_data()["stocks"]]
+
+    def apply_edits(existing_data: dict) -> list[dict]:
+        # STEP 1: Apply symbol/buyPrice edits to the current file contents
+        existing_stocks = existing_data.get("stocks", [])
+
+        preliminary_stocks = []
+        for i, stock in enumerate(requested_stocks):
+            stock_dict = dict(stock)
+            symbol = stock_dict["symbol"].upper().strip()
+            stock_dict["symbol"] = symbol
+
+            # A row this request didn't change keeps the current symbol/buyPrice,
+            # so an autosave that landed while prices were being fetched isn't undone
+            if i < len(base_rows) and i < len(existing_stocks) and base_rows[i] == (symbol, stock_dict["buyPrice"]):
+                symbol = existing_stocks[i].get("symbol", "").upper().strip()
+                stock_dict["symbol"] = symbol
+                stock_dict["buyPrice"] = existing_stocks[i].get("buyPrice", 0)
+
+            # Preserve existing price data if symbol unchanged
+            if i < len(existing_stocks) and existing_stocks[i].get("symbol", "").upper() == symbol:
+                stock_dict["price"] = existing_stocks[i].get("price", 0)
+                stock_dict["changePercent"] = existing_stocks[i].get("changePercent", 0)
+                stock_dict["date"] = existing_stocks[i].get("date", "")
+                stock_dict["name"] = existing_stocks[i].get("name", symbol)
+                stock_dict["diff"] = existing_stocks[i].get("diff", 0)
+            else:
+                # Symbol changed or new stock - set defaults
+                stock_dict["price"] = stock_dict.get("price", 0)
+                stock_dict["changePercent"] = stock_dict.get("changePercent", 0)
+                stock_dict["date"] = stock_dict.get("date", "")
+                stock_dict["name"] = stock_dict.get("name", symbol)
+                stock_dict["diff"] = stock_dict.get("diff", 0)
+
+            preliminary_stocks.append(stock_dict)
+
+        existing_data["stocks"] = preliminary_stocks
+        return preliminary_stocks
+
+    # STEP 2: Fetch yfinance data for stocks with valid symbols (concurrently), into copies
+    # Per-symbol errors are handled inside; if the fetch itself is interrupted
+    # (e.g. cancelled), still persist the user's edits before propagating
+    quotes = {}
+    for stock in requested_stocks:
+        symbol = stock["symbol"].upper().strip()
+        if symbol and symbol not in quotes:
+            quotes[symbol] = {}
+    try:
+        await _fetch_stock_quotes([(quote, symbol) for symbol, quote in quotes.items()])
+    except BaseException:
+        # Shielded so a second cancellation can't abort the save halfway through
+        saved_stocks = await asyncio.shield(_update_stock_data(apply_edits))
+        logger.warning(f"Price fetch interrupted - saved symbol/buyPrice edits for {len(saved_stocks)} stocks")
+        raise
+
+    def apply_quotes(existing_data: dict) -> list[dict]:
+        # Merge into the current file contents under the lock, so a save that
+        # landed while prices were being fetched isn't overwritten with stale data
+        updated_stocks = []
+        for stock_dict in apply_edits(existing_data):
+            symbol = stock_dict["symbol"]
+            quote = quotes.get(symbol)
+            if quote:
+                for field in STOCK_QUOTE_FIELDS:
+                    if field in quote:
+                        stock_dict[field] = quote[field]
+
+            # Always calculate diff: percentage difference from buy price (negative = above buy price)
+            price = stock_dict.get("price", 0)
+            buy_price = stock_dict.get("buyPrice", 0)
+
+            # If buyPrice is 0 (user didn't input any value), default to price * 0.9
+            if buy_price == 0 and price > 0:
+                buy_price = round(price * 0.9, 2)
+                stock_dict["buyPrice"] = buy_price
+                logger.info(f"Set default buyPrice for {symbol}: {buy_price} (90% of price {price})")
+
+            if price > 0:
+                diff = round(((buy_price - price) / price) * 100, 2)
+                stock_dict["diff"] = diff
+
+            updated_stocks.append(stock_dict)
+
+        existing_data["stocks"] = updated_stocks
+        return updated_stocks
 
     # STEP 3: Final save with updated prices
-    existing_data["stocks"] = updated_stocks
-    with open("stockapp.json", "w") as f:
-        json.dump(existing_data, f, indent=2)
+    updated_stocks = await _update_stock_data(apply_quotes)
     logger.info(f"Final save completed: {len(updated_stocks)} stocks with prices saved to stockapp.json")
 
     return {"message": "Stocks updated successfully", "stocks": updated_stocks}
@@ -513,57 +798,55 @@ async def autosave_stocks(request: StocksUpdateRequest):
     """
     logger.info(f"[autosave_stocks] Auto-saving {len(request.stocks)} stocks")
 
-    # Read existing data to preserve metadata and other fields
-    with open("stockapp.json", "r") as f:
-        existing_data = json.load(f)
-
-    # Build a map of existing stocks by index for preserving price data
-    existing_stocks = existing_data.get("stocks", [])
-
-    updated_stocks = []
-    for i, stock in enumerate(request.stocks):
-        stock_dict = stock.model_dump()
-        symbol = stock.symbol.upper().strip()
-        stock_dict["symbol"] = symbol
-
-        # Preserve existing price data if available (from previous updates)
-        if i < len(existing_stocks):
-            existing = existing_stocks[i]
-            # Keep price, changePercent, date, name if not provided or if symbol unchanged
-            if existing.get("symbol", "").upper() == symbol:
-                stock_dict["price"] = existing.get("price", 0)
-                stock_dict["changePercent"] = existing.get("changePercent", 0)
-                stock_dict["date"] = existing.get("date", "")
-                stock_dict["name"] = existing.get("name", symbol)
+    def apply_edits(existing_data: dict) -> list[dict]:
+        # Build a map of existing stocks by index for preserving price data
+        existing_stocks = existing_data.get("stocks", [])
+
+        updated_stocks = []
+        for i, stock_dict in enumerate(STOCK_LIST_ADAPTER.dump_python(request.stocks)):
+            symbol = stock_dict["symbol"].upper().strip()
+            stock_dict["symbol"] = symbol
+
+            # Preserve existing price data if available (from previous updates)
+            if i < len(existing_stocks):
+                existing = existing_stocks[i]
+                # Keep price, changePercent, date, name if not provided or if symbol unchanged
+                if existing.get("symbol", "").upper() == symbol:
+                    stock_dict["price"] = existing.get("price", 0)
+                    stock_dict["changePercent"] = existing.get("changePercent", 0)
+                    stock_dict["date"] = existing.get("date", "")
+                    stock_dict["name"] = existing.get("name", symbol)
+                else:
+                    # Symbol changed - reset price data, will be fetched by scheduled task
+                    stock_dict["price"] = stock_dict.get("price", 0)
+                    stock_dict["changePercent"] = stock_dict.get("changePercent", 0)
+                    stock_dict["date"] = stock_dict.get("date", "")
+                    stock_dict["name"] = symbol
+
+            # Calculate diff based on current price and buyPrice
+            price = stock_dict.get("price", 0)
+            buy_price = stock_dict.get("buyPrice", 0)
+            if price > 0:
+                diff = round(((buy_price - price) / price) * 100, 2)
+                stock_dict["diff"] = diff
             else:
-                # Symbol changed - reset price data, will be fetched by scheduled task
-                stock_dict["price"] = stock_dict.get("price", 0)
-                stock_dict["changePercent"] = stock_dict.get("changePercent", 0)
-                stock_dict["date"] = stock_dict.get("date", "")
-                stock_dict["name"] = symbol
-
-        # Calculate diff based on current price and buyPrice
-        price = stock_dict.get("price", 0)
-        buy_price = stock_dict.get("buyPrice", 0)
-        if price > 0:
-            diff = round(((buy_price - price) / price) * 100, 2)
-            stock_dict["diff"] = diff
-        else:
-            stock_dict["diff"] = 0
+                stock_dict["diff"] = 0
+
+            updated_stocks.append(stock_dict)
+            logger.info(f"[autosave_stocks] Saved {symbol} with buyPrice={stock_dict.get('buyPrice')}")
 
-        updated_stocks.append(stock_dict)
-        logger.info(f"[autosave_stocks] Saved {symbol} with buyPrice={stock_dict.get('buyPrice')}")
+        # Write to stockapp.json (SOURCE OF TRUTH)
+        existing_data["stocks"] = updated_stocks
+        return updated_stocks
 
-    # Write to stockapp.json (SOURCE OF TRUTH)
-    existing_data["stocks"] = updated_stocks
-    with open("stockapp.json", "w") as f:
-        json.dump(existing_data, f, indent=2)
+    # Reads the current data under the lock, so an in-flight save isn't clobbered
+    updated_stocks = await _update_stock_data(apply_edits)
 
     logger.info(f"[autosave_stocks] Auto-save completed for {len(updated_stocks)} stocks")
     return {"message": "Stocks auto-saved successfully", "stocks": updated_stocks}
 
 
-def _perform_update_stocks() -> dict:
+async def _perform_update_stocks() -> dict:
     """Core logic to update stock prices from yfinance.
 
     Reads current stocks from stockapp.json, fetches fresh prices,
@@ -573,90 +856,47 @@ def _perform_update_stocks() -> dict:
         dict: Result with success status and count of updated stocks
     """
     # Read existing data
-    with open("stockapp.json", "r") as f:
-        existing_data = json.load(f)
-
-    existing_stocks = existing_data.get("stocks", [])
-    updated_stocks = []
-    updated_count = 0
+    existing_stocks = _load_stock_data()["stocks"]
 
+    # Fetch fresh prices for stocks with valid symbols (concurrently), into copies
+    quotes = {}
     for stock in existing_stocks:
-        stock_dict = dict(stock)
         symbol = stock.get("symbol", "").upper().strip()
-
-        if symbol:
-            logger.info(f"[_perform_update_stocks] Fetching fresh data for {symbol}")
-            try:
-                ticker = yf.Ticker(symbol)
-                info = ticker.info
-                stock_dict["name"] = info.get("longName") or info.get("shortName") or symbol
-
-                # Get next earnings/financial statements date (only future dates)
-                try:
-                    calendar = ticker.calendar
-                    earnings_dates = calendar.get('Earnings Date', []) if calendar else []
-                    today = datetime.now().date()
-                    # Filter to only future dates
-                    future_dates = []
-                    for ed in earnings_dates:
-                        if hasattr(ed, 'date'):
-                            ed_date = ed.date()
-                        else:
-                            ed_date = ed
-                        if ed_date >= today:
-                            future_dates.append(ed)
-                    if future_dates:
-                        next_earnings = future_dates[0]
-                        if hasattr(next_earnings, 'isoformat'):
-                            stock_dict["financialStatementsDate"] = next_earnings.isoformat()
-                        else:
-                            stock_dict["financialStatementsDate"] = str(next_earnings)
-                    else:
-                        stock_dict["financialStatementsDate"] = None
-                except Exception as cal_error:
-                    logger.warning(f"Could not get earnings date for {symbol}: {cal_error}")
-                    stock_dict["financialStatementsDate"] = None
-
-                # Get last closed price and calculate percentage change
-                history = ticker.history(period="2d")
-                if not history.empty:
-                    stock_dict["price"] = round(float(history['Close'].iloc[-1]), 2)
-                    trading_date = history.index[-1]
-                    price_date = format_market_close_time(trading_date)
-                    stock_dict["date"] = price_date
-
-                    # Calculate percentage change from previous day
-                    if len(history) >= 2:
-                        current_close = float(history['Close'].iloc[-1])
-                        previous_close = float(history['Close'].iloc[-2])
-                        change_percent = ((current_close - previous_close) / previous_close) * 100
-                        stock_dict["changePercent"] = round(change_percent, 2)
-                    else:
-                        stock_dict["changePercent"] = None
-
-                    updated_count += 1
-                    logger.info(f"[_perform_update_stocks] Updated {symbol}: ${stock_dict['price']} (change: {stock_dict.get('changePercent')}%)")
-            except Exception as e:
-                logger.error(f"[_perform_update_stocks] yfinance error for {symbol}: {e}")
-
-        # Calculate diff: percentage difference from buy price
-        price = stock_dict.get("price", 0)
-        buy_price = stock_dict.get("buyPrice", 0)
-
-        if buy_price == 0 and price > 0:
-            buy_price = round(price * 0.9, 2)
-            stock_dict["buyPrice"] = buy_price
-
-        if price > 0:
-            diff = round(((buy_price - price) / price) * 100, 2)
-            stock_dict["diff"] = diff
-
-        updated_stocks.append(stock_dict)
+        if symbol and symbol not in quotes:
+            quotes[symbol] = dict(stock)
+    updated_count = sum(await _fetch_stock_quotes([(quote, symbol) for symbol, quote in quotes.items()]))
+
+    def apply_quotes(data: dict) -> list[dict]:
+        # Merge into the current file contents rather than the snapshot above, so
+        # edits autosaved while prices were being fetched are kept
+        updated_stocks = []
+        for stock in data["stocks"]:
+            stock_dict = dict(stock)
+            quote = quotes.get(stock_dict.get("symbol", "").upper().strip())
+            if quote:
+                for field in STOCK_QUOTE_FIELDS:
+                    if field in quote:
+                        stock_dict[field] = quote[field]
+
+            # Calculate diff: percentage difference from buy price
+            price = stock_dict.get("price", 0)
+            buy_price = stock_dict.get("buyPrice", 0)
+
+            if buy_price == 0 and price > 0:
+                buy_price = round(price * 0.9, 2)
+                stock_dict["buyPrice"] = buy_price
+
+            if price > 0:
+                diff = round(((buy_price - price) / price) * 100, 2)
+                stock_dict["diff"] = diff
+
+            updated_stocks.append(stock_dict)
+
+        data["stocks"] = updated_stocks
+        return updated_stocks
 
     # Write updated data back to stockapp.json
-    existing_data["stocks"] = updated_stocks
-    with open("stockapp.json", "w") as f:
-        json.dump(existing_data, f, indent=2)
+    updated_stocks = await _update_stock_data(apply_quotes)
 
     logger.info(f"[_perform_update_stocks] Completed: {updated_count} stocks updated")
 
@@ -672,21 +912,16 @@ async def delete_stock(symbol: str):
     """Remove a stock from the portfolio by symbol."""
     symbol = symbol.upper().strip()
 
-    # Read existing data
-    with open("stockapp.json", "r") as f:
-        data = json.load(f)
-
-    # Filter out the stock with matching symbol
-    original_count = len(data["stocks"])
-    data["stocks"] = [s for s in data["stocks"] if s["symbol"].upper() != symbol]
+    def remove(data: dict) -> bool | None:
+        # Filter out the stock with matching symbol
+        original_count = len(data["stocks"])
+        data["stocks"] = [s for s in data["stocks"] if s["symbol"].upper() != symbol]
+        return True if len(data["stocks"]) != original_count else None
 
-    if len(data["stocks"]) == original_count:
+    # Saved back to stockapp.json only if a stock was removed
+    if await _update_stock_data(remove) is None:
         return {"message": f"Stock {symbol} not found", "success": False}
 
-    # Save updated data back to stockapp.json
-    with open("stockapp.json", "w") as f:
-        json.dump(data, f, indent=2)
-
     return {"message": f"Stock {symbol} removed successfully", "success": True}
 
 
@@ -703,57 +938,55 @@ async def reorder_stocks(request: ReorderRequest):
     from_index = request.fromIndex
     to_index = request.toIndex
 
-    # Read existing data
-    with open("stockapp.json", "r") as f:
-        data = json.load(f)
+    error = None
 
-    stocks = data.get("stocks", [])
+    def move(data: dict) -> list[dict] | None:
+        nonlocal error
+        stocks = data.get("stocks", [])
 
-    # Validate indices
-    if from_index < 0 or from_index >= len(stocks):
-        return {"success": False, "error": f"Invalid fromIndex: {from_index}"}
-    if to_index < 0 or to_index >= len(stocks):
-        return {"success": False, "error": f"Invalid toIndex: {to_index}"}
+        # Validate indices
+        if from_index < 0 or from_index >= len(stocks):
+            error = f"Invalid fromIndex: {from_index}"
+            return None
+        if to_index < 0 or to_index >= len(stocks):
+            error = f"Invalid toIndex: {to_index}"
+            return None
 
-    # Reorder: remove from old position and insert at new position
-    stock = stocks.pop(from_index)
-    stocks.insert(to_index, stock)
+        # Reorder: remove from old position and insert at new position
+        stock = stocks.pop(from_index)
+        stocks.insert(to_index, stock)
+        data["stocks"] = stocks
+        return stocks
 
-    # Save updated data back to stockapp.json
-    data["stocks"] = stocks
-    with open("stockapp.json", "w") as f:
-        json.dump(data, f, indent=2)
+    # Saved back to stockapp.json only if the indices were valid
+    stocks = await _update_stock_data(move)
+    if stocks is None:
+        return {"success": False, "error": error}
 
     logger.info(f"Stocks reordered: moved index {from_index} to {to_index}")
 
     return {"success": True, "stocks": stocks}
 
 
-def get_stock_news(symbol: str, name: str, change_percent: float) -> str:
-    """Fetch relevant news summary for a stock using AI chat API with web search."""
-    direction = "increased" if change_percent > 0 else "decreased"
-
-    # Load preferred news sources from email.json
-    try:
-        with open("email.json", "r") as f:
-            email_config = json.load(f)
-        news_sources = email_config.get("newsSearch", [])
-    except Exception as e:
-        logger.warning(f"[get_stock_news] Could not load newsSearch from email.json: {e}")
-        news_sources = []
-
-    # Build the prompt with preferred sources and movement-specific keywords
-    sources_instruction = ""
-    if news_sources:
-        sources_list = ", ".join(news_sources)
+# Lines in an agent response that look like thinking/planning text rather than news
+THINKING_PHRASES = (
+    'i will', 'i\'ll', 'let me', 'proceeding', 'reading article',
+    'opening article', 'now reading', 'searching for', 'looking for',
+    'reading the', 'opening the', 'attempting to', 'trying',
+    'will return', 'continuing', 'finalizing', 'returning only',
+    'now attempting', 'searching again',
+    # Agent trace patterns (internal debug output)
+    'completion_tool', 'research_agent', '.function.', 'with response:'
+)
+# Matches a whole line (plus its newline) that is blank or contains a thinking phrase
+THINKING_LINE_RE = re.compile(
+    r"^(?:[^\S\n]*|.*(?:" + "|".join(map(re.escape, THINKING_PHRASES)) + r").*)(?:\n|\Z)",
+    re.IGNORECASE | re.MULTILINE
+)
 
-        # Select movement-specific keywords based on direction
-        if change_percent > 0:
-            movement_keywords = "surge, spike, jump"
-        else:
-            movement_keywords = "plunge, dive, drop, tank"
 
-        sources_instruction = f"""
+# Prompt templates for get_stock_news, filled per stock with str.format_map
+NEWS_SOURCES_TEMPLATE = """
 PREFERRED SOURCES: Search these sites first: {sources_list}
 
 SEARCH KEYWORDS (use these in your search):
@@ -761,7 +994,7 @@ SEARCH KEYWORDS (use these in your search):
 - "{symbol} after-hours news"
 """
 
-    prompt = f"""Find news explaining why {symbol} ({name}) stock {direction} by {abs(change_percent):.2f}%.
+NEWS_PROMPT_TEMPLATE = """Find news explaining why {symbol} ({name}) stock {direction} by {abs_change:.2f}%.
 {sources_instruction}
 WORKFLOW (follow exactly):
 1. Call web_search ONCE to find relevant articles
@@ -773,6 +1006,47 @@ CRITICAL: After web_search, IMMEDIATELY call read_page on a relevant article URL
 
 Return ONLY the final summary. No planning text, no "I will", no "Let me" - just the news summary."""
 
+
+def _load_news_sources() -> list[str]:
+    """Load the preferred news sources (newsSearch) from email.json."""
+    try:
+        return _load_email_config().get("newsSearch", [])
+    except Exception as e:
+        logger.warning(f"[get_stock_news] Could not load newsSearch from email.json: {e}")
+        return []
+
+
+async def get_stock_news(symbol: str, name: str, change_percent: float, news_sources: list[str] | None = None) -> str:
+    """Fetch relevant news summary for a stock using AI chat API with web search.
+
+    Callers fetching news for several stocks should load news_sources once with
+    _load_news_sources() and pass it in; otherwise email.json is read per call.
+    """
+    direction = "increased" if change_percent > 0 else "decreased"
+
+    # Load preferred news sources from email.json
+    if news_sources is None:
+        news_sources = _load_news_sources()
+
+    # Build the prompt with preferred sources and movement-specific keywords
+    sources_instruction = ""
+    if news_sources:
+        # Select movement-specific keywords based on direction
+        movement_keywords = "surge, spike, jump" if change_percent > 0 else "plunge, dive, drop, tank"
+        sources_instruction = NEWS_SOURCES_TEMPLATE.format_map({
+            "sources_list": ", ".join(news_sources),
+            "symbol": symbol,
+            "movement_keywords": movement_keywords,
+        })
+
+    prompt = NEWS_PROMPT_TEMPLATE.format_map({
+        "symbol": symbol,
+        "name": name,
+        "direction": direction,
+        "abs_change": abs(change_percent),
+        "sources_instruction": sources_instruction,
+    })
+
     messages = [{"role": "user", "content": prompt}]
     final_response = ""
 
@@ -782,7 +1056,7 @@ Return ONLY the final summary. No planning text, no "I will", no "Let me" - just
         # supermind-agent-v1 has built-in web search - single call handles everything
         logger.info(f"[get_stock_news] Calling supermind-agent-v1 for {symbol}")
 
-        response = client.chat.completions.create(
+        response = await client.chat.completions.create(
             model="supermind-agent-v1",
             messages=messages,
             extra_query={"debug": "true"}  # Enable debug mode to see agent execution traces
@@ -806,55 +1080,87 @@ Return ONLY the final summary. No planning text, no "I will", no "Let me" - just
 
     # Clean up thinking/planning text from the response
     if final_response:
-        lines = final_response.split('\n')
-        cleaned_lines = []
-        for line in lines:
-            line_lower = line.lower().strip()
-            # Skip empty lines and lines that look like thinking/planning text
-            if not line.strip():
-                continue
-            if any(phrase in line_lower for phrase in [
-                'i will', 'i\'ll', 'let me', 'proceeding', 'reading article',
-                'opening article', 'now reading', 'searching for', 'looking for',
-                'reading the', 'opening the', 'attempting to', 'trying',
-                'will return', 'continuing', 'finalizing', 'returning only',
-                'now attempting', 'searching again',
-                # Agent trace patterns (internal debug output)
-                'completion_tool', 'research_agent', '.function.', 'with response:'
-            ]):
-                continue
-            cleaned_lines.append(line)
-        final_response = '\n'.join(cleaned_lines).strip()
+        final_response = THINKING_LINE_RE.sub("", final_response).strip()
         logger.info(f"[get_stock_news] Cleaned response for {symbol}: {final_response[:200] if final_response else 'EMPTY'}")
 
     return final_response
 
 
+# News summaries from earlier runs, keyed by _news_cache_key(); the news for a
+# given trading day and direction doesn't change, so re-running skips the LLM call
+NEWS_CACHE_PATH = "news_cache.json"
+
+
+# Max get_stock_news LLM calls in flight at once during Update News
+NEWS_MAX_CONCURRENCY = 4
+
+
+def _news_cache_key(stock: dict) -> str | None:
+    """Return "SYMBOL:YYYY-MM-DD:up|dn" for a stock, or None if it has no price date."""
+    date = stock.get("date") or ""
+    if not date:
+        return None
+    return f"{stock['symbol']}:{date[:10]}:{'up' if stock['changePercent'] > 0 else 'dn'}"
+
+
+def _load_news_cache() -> dict:
+    """Load news_cache.json via the mtime cache; a missing or corrupt file is an empty cache."""
+    try:
+        return _read_json_cached(NEWS_CACHE_PATH)
+    except (FileNotFoundError, orjson.JSONDecodeError) as e:
+        if not isinstance(e, FileNotFoundError):
+            logger.warning(f"Ignoring unreadable {NEWS_CACHE_PATH}: {e}")
+        return {}
+
+
 async def _perform_update_email() -> dict:
     """Core logic to update email.json with dailyPriceChange and needToDropUntilBuyPrice from stockapp.json.
 
+    News for a stock is reused from news_cache.json when the same symbol, price
+    date and direction were already summarized.
+
     Returns:
         dict: Result with success status and counts
     """
     # Read stockapp.json
-    with open("stockapp.json", "r") as f:
-        stock_data = json.load(f)
+    stock_data = _read_json_cached("stockapp.json")
+
+    # Preferred news sources are shared by every stock, so read email.json once
+    news_sources = _load_news_sources()
+    news_cache = _load_news_cache()
+    current_news = {}
 
     # Filter stocks where |changePercent| > 5 for dailyPriceChange
-    filtered = []
-    for s in stock_data["stocks"]:
-        if abs(s.get("changePercent", 0) or 0) > 5:
+    movers = [s for s in stock_data["stocks"] if abs(s.get("changePercent", 0) or 0) > 5]
+
+    # Fetch news for every cache miss concurrently, at most NEWS_MAX_CONCURRENCY
+    # LLM calls in flight at a time
+    semaphore = asyncio.Semaphore(NEWS_MAX_CONCURRENCY)
+
+    async def fetch_news(s: dict) -> tuple[str | None, str]:
+        cache_key = _news_cache_key(s)
+        news = news_cache.get(cache_key) if cache_key else None
+        if news:
+            logger.info(f"Using cached news for {s['symbol']} ({cache_key})")
+            return cache_key, news
+        async with semaphore:
             logger.info(f"Fetching news for {s['symbol']}...")
-            news = get_stock_news(s["symbol"], s["name"], s["changePercent"])
-            filtered.append({
-                "symbol": s["symbol"],
-                "name": s["name"],
-                "price": s["price"],
-                "changePercent": s["changePercent"],
-                "date": s.get("date", ""),
-                "financialStatementsDate": s.get("financialStatementsDate"),
-                "news": news
-            })
+            news = await get_stock_news(s["symbol"], s["name"], s["changePercent"], news_sources)
+        return cache_key, news
+
+    filtered = []
+    for s, (cache_key, news) in zip(movers, await asyncio.gather(*(fetch_news(s) for s in movers))):
+        if cache_key and news:
+            current_news[cache_key] = news
+        filtered.append({
+            "symbol": s["symbol"],
+            "name": s["name"],
+            "price": s["price"],
+            "changePercent": s["changePercent"],
+            "date": s.get("date", ""),
+            "financialStatementsDate": s.get("financialStatementsDate"),
+            "news": news
+        })
 
     # Get all stocks for needToDropUntilBuyPrice (symbol, price, buyPrice, diff, date, financialStatementsDate)
     diff_to_buy = [
@@ -869,15 +1175,17 @@ async def _perform_update_email() -> dict:
         for s in stock_data["stocks"]
     ]
 
-    # Read email.json, update both arrays, write back
-    with open("email.json", "r") as f:
-        email_data = json.load(f)
+    # Read email.json, update both arrays, write back (file I/O in a worker thread)
+    email_data = await asyncio.to_thread(_read_json_fresh, "email.json")
 
     email_data["content"]["dailyPriceChange"] = filtered
     email_data["content"]["needToDropUntilBuyPrice"] = diff_to_buy
 
-    with open("email.json", "w") as f:
-        json.dump(email_data, f, indent=2)
+    await asyncio.to_thread(_write_json_atomic, "email.json", email_data)
+
+    # Keep only this run's entries so the cache doesn't grow without bound
+    if current_news != news_cache:
+        await asyncio.to_thread(_write_json_atomic, NEWS_CACHE_PATH, current_news)
 
     return {
         "success": True,
@@ -896,17 +1204,25 @@ async def update_email():
 # Apple-Inspired Email Template Helper Functions
 # ============================================================================
 
+# (format template, color) pairs picked by sign, so each formatter is one lookup + one str.format
+CHANGE_POSITIVE = ("+{:.2f}%", "#4cd964")  # Light Apple Green
+CHANGE_NEGATIVE = ("{:.2f}%", "#ff3b30")  # Apple Red
+DIFF_POSITIVE = ("+{:.1f}%", "#4cd964")  # Light Apple Green (below buy price - good to buy)
+DIFF_NEGATIVE = ("{:.1f}%", "#ff3b30")  # Apple Red (above buy price - not ideal)
+
+# Bound str.format of the price template
+_format_price = "${:,.2f}".format
+
+
 def format_price(price: float) -> str:
     """Format price as $X,XXX.XX"""
-    return f"${price:,.2f}"
+    return _format_price(price)
 
 
 def format_change_percent(change: float) -> tuple[str, str]:
     """Return (formatted_string, color) for daily price change."""
-    if change >= 0:
-        return f"+{change:.2f}%", "#4cd964"  # Light Apple Green
-    else:
-        return f"{change:.2f}%", "#ff3b30"  # Apple Red
+    template, color = CHANGE_POSITIVE if change >= 0 else CHANGE_NEGATIVE
+    return template.format(change), color
 
 
 def format_diff_percent(diff: float) -> tuple[str, str]:
@@ -914,101 +1230,111 @@ def format_diff_percent(diff: float) -> tuple[str, str]:
     Negative = price above buy price (red, not ideal to buy)
     Positive = price below buy price (green, good to buy)
     """
-    if diff >= 0:
-        return f"+{diff:.1f}%", "#4cd964"  # Light Apple Green (below buy price - good to buy)
-    else:
-        return f"{diff:.1f}%", "#ff3b30"  # Apple Red (above buy price - not ideal)
+    template, color = DIFF_POSITIVE if diff >= 0 else DIFF_NEGATIVE
+    return template.format(diff), color
 
 
-def parse_news_headlines(news_string: str) -> list[str]:
-    """Parse '- headline' format into list of headlines."""
-    if not news_string:
-        return []
+# Most headlines shown per Daily Price Change card
+MAX_NEWS_HEADLINES = 3
+
+
+def parse_news_headlines(news_string: str, limit: int = MAX_NEWS_HEADLINES) -> list[str]:
+    """Parse '- headline' format into a list of at most `limit` headlines."""
     headlines = []
-    for line in news_string.strip().split('\n'):
+    if not news_string:
+        return headlines
+    for line in news_string.splitlines():
         line = line.strip()
-        if line.startswith('- '):
-            headlines.append(line[2:])
-        elif line:
-            headlines.append(line)
+        if line:
+            headlines.append(line.removeprefix('- '))
+            if len(headlines) >= limit:
+                break
     return headlines
 
 
-def generate_stock_card_html(stock: dict) -> str:
-    """Generate HTML for a Daily Price Change stock card."""
-    symbol = stock.get("symbol", "")
-    name = stock.get("name", "")
-    price = stock.get("price", 0)
-    change_percent = stock.get("changePercent", 0)
-    news = stock.get("news", "")
-
-    formatted_price = format_price(price)
-    change_str, change_color = format_change_percent(change_percent)
-    headlines = parse_news_headlines(news)
+# Font stack shared by every inline style in the email
+FONT_STACK = "-apple-system, BlinkMacSystemFont, 'SF Pro Display', 'Helvetica Neue', Helvetica, Arial, sans-serif"
 
-    # Build news section HTML
-    news_html = ""
-    if headlines:
-        news_items = "".join([
-            f'''<tr>
-                <td style="padding: 8px 0 8px 16px; font-family: -apple-system, BlinkMacSystemFont, 'SF Pro Display', 'Helvetica Neue', Helvetica, Arial, sans-serif; font-size: 14px; color: #1d1d1f; line-height: 1.5; border-left: 3px solid #0071e3;">
-                    {headline}
+# News fragments for the Daily Price Change card, each with a single {0} slot
+NEWS_ROW_TEMPLATE = f'''<tr>
+                <td style="padding: 8px 0 8px 16px; font-family: {FONT_STACK}; font-size: 14px; color: #1d1d1f; line-height: 1.5; border-left: 3px solid #0071e3;">
+                    {{0}}
                 </td>
             </tr>'''
-            for headline in headlines[:3]
-        ])
-        news_html = f'''
+
+NEWS_SECTION_TEMPLATE = f'''
         <tr>
             <td colspan="2" style="padding-top: 16px;">
                 <table role="presentation" width="100%" cellpadding="0" cellspacing="0" border="0">
                     <tr>
-                        <td style="padding-bottom: 8px; font-family: -apple-system, BlinkMacSystemFont, 'SF Pro Display', 'Helvetica Neue', Helvetica, Arial, sans-serif; font-size: 12px; font-weight: 600; color: #86868b; text-transform: uppercase; letter-spacing: 0.5px;">
+                        <td style="padding-bottom: 8px; font-family: {FONT_STACK}; font-size: 12px; font-weight: 600; color: #86868b; text-transform: uppercase; letter-spacing: 0.5px;">
                             Latest News
                         </td>
                     </tr>
-                    {news_items}
+                    {{0}}
                 </table>
             </td>
         </tr>'''
 
-    return f'''
+
+# Card bodies, built once with the font stack baked in and filled per stock via str.format_map
+STOCK_CARD_TEMPLATE = f'''
     <table role="presentation" width="100%" cellpadding="0" cellspacing="0" border="0" style="background-color: #f5f5f7; border-radius: 12px; margin-bottom: 16px;">
         <tr>
             <td style="padding: 24px;">
                 <table role="presentation" width="100%" cellpadding="0" cellspacing="0" border="0">
                     <tr>
                         <td style="vertical-align: top;">
-                            <span style="font-family: -apple-system, BlinkMacSystemFont, 'SF Pro Display', 'Helvetica Neue', Helvetica, Arial, sans-serif; font-size: 20px; font-weight: 600; color: #1d1d1f;">{symbol}</span>
+                            <span style="font-family: {FONT_STACK}; font-size: 20px; font-weight: 600; color: #1d1d1f;">{{symbol}}</span>
                             <br>
-                            <span style="font-family: -apple-system, BlinkMacSystemFont, 'SF Pro Display', 'Helvetica Neue', Helvetica, Arial, sans-serif; font-size: 14px; color: #86868b;">{name}</span>
+                            <span style="font-family: {FONT_STACK}; font-size: 14px; color: #86868b;">{{name}}</span>
                         </td>
                         <td style="text-align: right; vertical-align: top;">
-                            <span style="font-family: -apple-system, BlinkMacSystemFont, 'SF Pro Display', 'Helvetica Neue', Helvetica, Arial, sans-serif; font-size: 28px; font-weight: 500; color: #1d1d1f;">{formatted_price}</span>
+                            <span style="font-family: {FONT_STACK}; font-size: 28px; font-weight: 500; color: #1d1d1f;">{{formatted_price}}</span>
                             <br>
-                            <span style="font-family: -apple-system, BlinkMacSystemFont, 'SF Pro Display', 'Helvetica Neue', Helvetica, Arial, sans-serif; font-size: 17px; font-weight: 500; color: {change_color};">{change_str}</span>
+                            <span style="font-family: {FONT_STACK}; font-size: 17px; font-weight: 500; color: {{change_color}};">{{change_str}}</span>
                         </td>
                     </tr>
-                    {news_html}
+                    {{news_html}}
                 </table>
             </td>
         </tr>
     </table>'''
 
 
-def generate_diff_card_html(stock: dict) -> str:
-    """Generate HTML for a Need to Drop Until Buy Price stock card (mobile-optimized)."""
+# Same card with the news slot already removed, for stocks without headlines
+STOCK_CARD_NO_NEWS_TEMPLATE = STOCK_CARD_TEMPLATE.replace("{news_html}", "")
+
+
+def generate_stock_card_html(stock: dict) -> str:
+    """Generate HTML for a Daily Price Change stock card."""
     symbol = stock.get("symbol", "")
+    name = stock.get("name", "")
     price = stock.get("price", 0)
-    buy_price = stock.get("buyPrice", 0)
-    diff = stock.get("diff", 0)
-    earnings_date = stock.get("financialStatementsDate")
+    change_percent = stock.get("changePercent", 0)
+    news = stock.get("news", "")
 
     formatted_price = format_price(price)
-    formatted_buy_price = format_price(buy_price)
-    diff_str, diff_color = format_diff_percent(diff)
-    formatted_earnings = earnings_date if earnings_date else "TBD"
+    change_str, change_color = format_change_percent(change_percent)
+    headlines = parse_news_headlines(news)
+
+    fields = {
+        "symbol": symbol,
+        "name": name,
+        "formatted_price": formatted_price,
+        "change_color": change_color,
+        "change_str": change_str,
+    }
+    if not headlines:
+        return STOCK_CARD_NO_NEWS_TEMPLATE.format_map(fields)
 
-    return f'''
+    # Build news section HTML
+    news_items = "".join([NEWS_ROW_TEMPLATE.format(headline) for headline in headlines])
+    fields["news_html"] = NEWS_SECTION_TEMPLATE.format(news_items)
+    return STOCK_CARD_TEMPLATE.format_map(fields)
+
+
+DIFF_CARD_TEMPLATE = f'''
     <table role="presentation" width="100%" cellpadding="0" cellspacing="0" border="0" style="background-color: #f5f5f7; border-radius: 12px; margin-bottom: 12px;">
         <tr>
             <td style="padding: 16px;">
@@ -1016,20 +1342,20 @@ def generate_diff_card_html(stock: dict) -> str:
                     <!-- Row 1: Symbol | Earnings | Diff% (rowspan=2) -->
                     <tr>
                         <td style="vertical-align: middle;">
-                            <span style="font-family: -apple-system, BlinkMacSystemFont, 'SF Pro Display', 'Helvetica Neue', Helvetica, Arial, sans-serif; font-size: 18px; font-weight: 600; color: #1d1d1f;">{symbol}</span>
+                            <span style="font-family: {FONT_STACK}; font-size: 18px; font-weight: 600; color: #1d1d1f;">{{symbol}}</span>
                         </td>
                         <td style="text-align: left; vertical-align: middle; padding-right: 12px; width: 120px;">
-                            <span style="font-family: -apple-system, BlinkMacSystemFont, 'SF Pro Display', 'Helvetica Neue', Helvetica, Arial, sans-serif; font-size: 12px; color: #86868b;">Earnings: {formatted_earnings}</span>
+                            <span style="font-family: {FONT_STACK}; font-size: 12px; color: #86868b;">Earnings: {{formatted_earnings}}</span>
                         </td>
                         <td rowspan="2" style="text-align: right; vertical-align: middle; width: 70px;">
-                            <span style="display: inline-block; padding: 12px 10px; background-color: {diff_color}; color: #ffffff; font-family: -apple-system, BlinkMacSystemFont, 'SF Pro Display', 'Helvetica Neue', Helvetica, Arial, sans-serif; font-size: 18px; font-weight: 700; border-radius: 8px;">{diff_str}</span>
+                            <span style="display: inline-block; padding: 12px 10px; background-color: {{diff_color}}; color: #ffffff; font-family: {FONT_STACK}; font-size: 18px; font-weight: 700; border-radius: 8px;">{{diff_str}}</span>
                         </td>
                     </tr>
                     <!-- Row 2: Price → Buy -->
                     <tr>
                         <td colspan="2" style="padding-top: 6px;">
-                            <span style="font-family: -apple-system, BlinkMacSystemFont, 'SF Pro Display', 'Helvetica Neue', Helvetica, Arial, sans-serif; font-size: 15px; font-weight: 500; color: #0071e3;">{formatted_price}</span>
-                            <span style="font-family: -apple-system, BlinkMacSystemFont, 'SF Pro Display', 'Helvetica Neue', Helvetica, Arial, sans-serif; font-size: 13px; color: #86868b;"> → Buy: {formatted_buy_price}</span>
+                            <span style="font-family: {FONT_STACK}; font-size: 15px; font-weight: 500; color: #0071e3;">{{formatted_price}}</span>
+                            <span style="font-family: {FONT_STACK}; font-size: 13px; color: #86868b;"> → Buy: {{formatted_buy_price}}</span>
                         </td>
                     </tr>
                 </table>
@@ -1038,48 +1364,32 @@ def generate_diff_card_html(stock: dict) -> str:
     </table>'''
 
 
-def generate_stock_email_html():
-    """Generate Apple-inspired HTML email content with stock portfolio sections from email.json."""
-    # Load email content from email.json
-    with open("email.json", "r") as f:
-        email_config = json.load(f)
-
-    content = email_config.get("content", {})
-    daily_price_change = content.get("dailyPriceChange", [])
-    diff_to_buy_price = content.get("needToDropUntilBuyPrice", [])
+def generate_diff_card_html(stock: dict) -> str:
+    """Generate HTML for a Need to Drop Until Buy Price stock card (mobile-optimized)."""
+    symbol = stock.get("symbol", "")
+    price = stock.get("price", 0)
+    buy_price = stock.get("buyPrice", 0)
+    diff = stock.get("diff", 0)
+    earnings_date = stock.get("financialStatementsDate")
 
-    # Generate Daily Price Change cards
-    daily_change_cards = ""
-    if daily_price_change:
-        daily_change_cards = "".join(generate_stock_card_html(stock) for stock in daily_price_change)
-    else:
-        daily_change_cards = '''
-        <table role="presentation" width="100%" cellpadding="0" cellspacing="0" border="0" style="background-color: #f5f5f7; border-radius: 12px;">
-            <tr>
-                <td style="padding: 32px; text-align: center; font-family: -apple-system, BlinkMacSystemFont, 'SF Pro Display', 'Helvetica Neue', Helvetica, Arial, sans-serif; font-size: 15px; color: #86868b;">
-                    No significant price changes today
-                </td>
-            </tr>
-        </table>'''
+    formatted_price = format_price(price)
+    formatted_buy_price = format_price(buy_price)
+    diff_str, diff_color = format_diff_percent(diff)
+    formatted_earnings = earnings_date if earnings_date else "TBD"
 
-    # Generate Need to Drop Until Buy Price cards
-    diff_cards = ""
-    if diff_to_buy_price:
-        diff_cards = "".join(generate_diff_card_html(stock) for stock in diff_to_buy_price)
-    else:
-        diff_cards = '''
-        <table role="presentation" width="100%" cellpadding="0" cellspacing="0" border="0" style="background-color: #f5f5f7; border-radius: 12px;">
-            <tr>
-                <td style="padding: 32px; text-align: center; font-family: -apple-system, BlinkMacSystemFont, 'SF Pro Display', 'Helvetica Neue', Helvetica, Arial, sans-serif; font-size: 15px; color: #86868b;">
-                    No stocks in portfolio
-                </td>
-            </tr>
-        </table>'''
+    return DIFF_CARD_TEMPLATE.format_map({
+        "symbol": symbol,
+        "formatted_earnings": formatted_earnings,
+        "diff_color": diff_color,
+        "diff_str": diff_str,
+        "formatted_price": formatted_price,
+        "formatted_buy_price": formatted_buy_price,
+    })
 
-    # Get current date for footer
-    current_date = datetime.now().strftime("%B %d, %Y")
 
-    return f'''<!DOCTYPE html>
+# Static shell of the report email. Only the card lists and the date are dynamic,
+# so the constant parts are built once at import and stitched together with str.join.
+EMAIL_HTML_HEADER = f'''<!DOCTYPE html>
 <html lang="en" xmlns="http://www.w3.org/1999/xhtml" xmlns:v="urn:schemas-microsoft-com:vml" xmlns:o="urn:schemas-microsoft-com:office:office">
 <head>
     <meta charset="UTF-8">
@@ -1106,7 +1416,7 @@ def generate_stock_email_html():
     </noscript>
     <![endif]-->
 </head>
-<body style="margin: 0; padding: 0; background-color: #ffffff; font-family: -apple-system, BlinkMacSystemFont, 'SF Pro Display', 'Helvetica Neue', Helvetica, Arial, sans-serif;">
+<body style="margin: 0; padding: 0; background-color: #ffffff; font-family: {FONT_STACK};">
     <!-- Outer wrapper table for centering -->
     <table role="presentation" width="100%" cellpadding="0" cellspacing="0" border="0" style="background-color: #ffffff;">
         <tr>
@@ -1127,10 +1437,10 @@ def generate_stock_email_html():
                                     </td>
                                 </tr>
                             </table>
-                            <h1 style="margin: 0; font-family: -apple-system, BlinkMacSystemFont, 'SF Pro Display', 'Helvetica Neue', Helvetica, Arial, sans-serif; font-size: 32px; font-weight: 600; color: #1d1d1f; letter-spacing: -0.5px;">
+                            <h1 style="margin: 0; font-family: {FONT_STACK}; font-size: 32px; font-weight: 600; color: #1d1d1f; letter-spacing: -0.5px;">
                                 Stock Tracker
                             </h1>
-                            <p style="margin: 8px 0 0 0; font-family: -apple-system, BlinkMacSystemFont, 'SF Pro Display', 'Helvetica Neue', Helvetica, Arial, sans-serif; font-size: 17px; color: #86868b; font-weight: 400;">
+                            <p style="margin: 8px 0 0 0; font-family: {FONT_STACK}; font-size: 17px; color: #86868b; font-weight: 400;">
                                 Daily Portfolio Report
                             </p>
                         </td>
@@ -1153,16 +1463,18 @@ def generate_stock_email_html():
                             <table role="presentation" width="100%" cellpadding="0" cellspacing="0" border="0" style="background-color: #0071e3; border-radius: 8px; margin-bottom: 24px;">
                                 <tr>
                                     <td style="padding: 16px 20px;">
-                                        <h2 style="margin: 0; font-family: -apple-system, BlinkMacSystemFont, 'SF Pro Display', 'Helvetica Neue', Helvetica, Arial, sans-serif; font-size: 24px; font-weight: 600; color: #ffffff;">
+                                        <h2 style="margin: 0; font-family: {FONT_STACK}; font-size: 24px; font-weight: 600; color: #ffffff;">
                                             Daily Price Change
                                         </h2>
-                                        <p style="margin: 4px 0 0 0; font-family: -apple-system, BlinkMacSystemFont, 'SF Pro Display', 'Helvetica Neue', Helvetica, Arial, sans-serif; font-size: 15px; color: rgba(255,255,255,0.8);">
+                                        <p style="margin: 4px 0 0 0; font-family: {FONT_STACK}; font-size: 15px; color: rgba(255,255,255,0.8);">
                                             Stocks with significant movements
                                         </p>
                                     </td>
                                 </tr>
                             </table>
-                            {daily_change_cards}
+                            '''
+
+EMAIL_HTML_MIDDLE = f'''
                         </td>
                     </tr>
 
@@ -1183,16 +1495,18 @@ def generate_stock_email_html():
                             <table role="presentation" width="100%" cellpadding="0" cellspacing="0" border="0" style="background-color: #0071e3; border-radius: 8px; margin-bottom: 24px;">
                                 <tr>
                                     <td style="padding: 16px 20px;">
-                                        <h2 style="margin: 0; font-family: -apple-system, BlinkMacSystemFont, 'SF Pro Display', 'Helvetica Neue', Helvetica, Arial, sans-serif; font-size: 24px; font-weight: 600; color: #ffffff;">
+                                        <h2 style="margin: 0; font-family: {FONT_STACK}; font-size: 24px; font-weight: 600; color: #ffffff;">
                                             Need to Drop Until Buy Price
                                         </h2>
-                                        <p style="margin: 4px 0 0 0; font-family: -apple-system, BlinkMacSystemFont, 'SF Pro Display', 'Helvetica Neue', Helvetica, Arial, sans-serif; font-size: 15px; color: rgba(255,255,255,0.8);">
+                                        <p style="margin: 4px 0 0 0; font-family: {FONT_STACK}; font-size: 15px; color: rgba(255,255,255,0.8);">
                                             Distance from target buy prices
                                         </p>
                                     </td>
                                 </tr>
                             </table>
-                            {diff_cards}
+                            '''
+
+EMAIL_HTML_FOOTER_PRE_DATE = f'''
                         </td>
                     </tr>
 
@@ -1210,11 +1524,13 @@ def generate_stock_email_html():
                     <!-- Footer Section -->
                     <tr>
                         <td align="center" style="padding: 0;">
-                            <p style="margin: 0; font-family: -apple-system, BlinkMacSystemFont, 'SF Pro Display', 'Helvetica Neue', Helvetica, Arial, sans-serif; font-size: 14px; font-weight: 600; color: #1d1d1f;">
+                            <p style="margin: 0; font-family: {FONT_STACK}; font-size: 14px; font-weight: 600; color: #1d1d1f;">
                                 Stock Tracker Report
                             </p>
-                            <p style="margin: 8px 0 0 0; font-family: -apple-system, BlinkMacSystemFont, 'SF Pro Display', 'Helvetica Neue', Helvetica, Arial, sans-serif; font-size: 13px; color: #86868b;">
-                                Generated on {current_date}
+                            <p style="margin: 8px 0 0 0; font-family: {FONT_STACK}; font-size: 13px; color: #86868b;">
+                                Generated on '''
+
+EMAIL_HTML_FOOTER_POST_DATE = '''
                             </p>
                         </td>
                     </tr>
@@ -1226,15 +1542,110 @@ def generate_stock_email_html():
 </body>
 </html>'''
 
+EMPTY_DAILY_CHANGE_HTML = f'''
+        <table role="presentation" width="100%" cellpadding="0" cellspacing="0" border="0" style="background-color: #f5f5f7; border-radius: 12px;">
+            <tr>
+                <td style="padding: 32px; text-align: center; font-family: {FONT_STACK}; font-size: 15px; color: #86868b;">
+                    No significant price changes today
+                </td>
+            </tr>
+        </table>'''
+
+EMPTY_DIFF_HTML = f'''
+        <table role="presentation" width="100%" cellpadding="0" cellspacing="0" border="0" style="background-color: #f5f5f7; border-radius: 12px;">
+            <tr>
+                <td style="padding: 32px; text-align: center; font-family: {FONT_STACK}; font-size: 15px; color: #86868b;">
+                    No stocks in portfolio
+                </td>
+            </tr>
+        </table>'''
+
+
+# [date ordinal, formatted footer date] - the footer date only changes once a day
+_report_date_cache = [0, ""]
+
+
+def _report_date() -> str:
+    """Return today's date as "January 25, 2026", formatting it once per day."""
+    today = date.today()
+    ordinal = today.toordinal()
+    if _report_date_cache[0] != ordinal:
+        _report_date_cache[0] = ordinal
+        _report_date_cache[1] = today.strftime("%B %d, %Y")
+    return _report_date_cache[1]
+
+
+# [email.json "content" object, footer date, rendered HTML] from the last render.
+# _read_json_cached() hands out the same object until email.json changes, so an
+# identity check is enough to know the content is unchanged.
+_email_html_cache = [None, "", ""]
+
+
+def generate_stock_email_html(email_config: dict | None = None):
+    """Generate Apple-inspired HTML email content with stock portfolio sections from email.json.
+
+    The HTML depends only on the content and the date, so a repeat render of the
+    same content object on the same day returns the previous result.
+
+    Args:
+        email_config: Parsed email.json; loaded via _load_email_config() when omitted
+    """
+    # Load email content from email.json
+    if email_config is None:
+        email_config = _load_email_config()
+
+    content = email_config.get("content", {})
+    current_date = _report_date()
+    if _email_html_cache[0] is content and _email_html_cache[1] == current_date:
+        return _email_html_cache[2]
+
+    daily_price_change = content.get("dailyPriceChange", [])
+    diff_to_buy_price = content.get("needToDropUntilBuyPrice", [])
+
+    # One flat list of fragments (static shell, cards, footer date) joined once,
+    # rather than joining each card list and then the page
+    parts = [EMAIL_HTML_HEADER]
+
+    # Daily Price Change cards
+    if daily_price_change:
+        parts += [generate_stock_card_html(stock) for stock in daily_price_change]
+    else:
+        parts.append(EMPTY_DAILY_CHANGE_HTML)
+
+    parts.append(EMAIL_HTML_MIDDLE)
+
+    # Need to Drop Until Buy Price cards
+    if diff_to_buy_price:
+        parts += [generate_diff_card_html(stock) for stock in diff_to_buy_price]
+    else:
+        parts.append(EMPTY_DIFF_HTML)
+
+    # Footer with the current date
+    parts += (EMAIL_HTML_FOOTER_PRE_DATE, current_date, EMAIL_HTML_FOOTER_POST_DATE)
+
+    email_html = "".join(parts)
+    _email_html_cache[:] = (content, current_date, email_html)
+    return email_html
+
+# Plain-text part for clients that can't render the HTML report
+EMAIL_PLAIN_TEXT = "Please view this email in an HTML-capable email client."
+
+
+def _send_via_gmail(msg: EmailMessage, gmail_user: str, gmail_app_password: str) -> None:
+    """Send a message through Gmail's SMTP server over SSL (blocking)."""
+    with smtplib.SMTP_SSL("smtp.gmail.com", 465, timeout=30) as smtp:
+        smtp.login(gmail_user, gmail_app_password)
+        smtp.send_message(msg)
+
+
 async def _perform_send_email() -> dict:
     """Core logic to send email using Gmail SMTP.
 
     Returns:
         dict: Result with status, recipients, and response details
     """
-    # Load email configuration from email.json
-    with open("email.json", "r") as f:
-        email_config = json.load(f)
+    # Load email configuration from email.json (off the event loop; stat/read are blocking)
+    email_config = await asyncio.to_thread(_load_email_config)
 
     email_to = email_config.get("to", [])
     email_subject = email_config.get("subject", "Stocker Tracker Report")
@@ -1250,21 +1661,21 @@ async def _perform_send_email() -> dict:
         return {"status": "error", "message": "GMAIL_USER or GMAIL_APP_PASSWORD not configured"}
 
     # Generate email HTML content
-    email_html = generate_stock_email_html()
+    email_html = generate_stock_email_html(email_config)
 
     # Create email message
     msg = EmailMessage()
     msg["Subject"] = email_subject
     msg["From"] = gmail_user
     msg["To"] = ", ".join(email_to)
-    msg.set_content("Please view this email in an HTML-capable email client.")
-    msg.add_alternative(email_html, subtype="html")
+    msg.set_content(EMAIL_PLAIN_TEXT)
+    # The HTML has lines over 78 chars; naming the encoding skips encoding it both
+    # ways (quoted-printable and base64) just to keep the shorter one
+    msg.add_alternative(email_html, subtype="html", cte="quoted-printable")
 
-    # Send via Gmail SMTP
+    # Send via Gmail SMTP in a worker thread (connect, TLS handshake and login all block)
     try:
-        with smtplib.SMTP_SSL("smtp.gmail.com", 465) as smtp:
-            smtp.login(gmail_user, gmail_app_password)
-            smtp.send_message(msg)
+        await asyncio.to_thread(_send_via_gmail, msg, gmail_user, gmail_app_password)
         return {"status": "sent", "recipients": email_to}
     except Exception as e:
         return {"status": "error", "message": str(e)}
@@ -1277,6 +1688,81 @@ async def send_test_email():
     return result
 
 
+# In-memory copy of schedule.json: re-read only when the file's mtime changes
+# (e.g. an operator edit), written through on every change.
+# Task trigger_time values are held as datetimes; orjson writes them back as ISO 8601.
+_schedule_cache: dict | None = None
+_schedule_mtime_ns = 0
+
+
+def _load_schedule() -> dict:
+    """Return the parsed schedule, reading schedule.json only when it changed on disk.
+
+    The file is checked with _validate_schedule() and each task's trigger_time
+    is parsed once here, so callers get an aware datetime rather than a string.
+    The returned dict is shared - deep-copy it before mutating, then persist
+    the copy with _save_schedule().
+    """
+    global _schedule_cache, _schedule_mtime_ns
+    mtime_ns = os.stat("schedule.json").st_mtime_ns
+    if _schedule_cache is None or mtime_ns != _schedule_mtime_ns:
+        with open("schedule.json", "rb") as f:
+            schedule_data = orjson.loads(f.read())
+        _validate_schedule(schedule_data)
+        for task_config in schedule_data.values():
+            task_config["trigger_time"] = _parse_trigger_time(task_config["trigger_time"])
+        _schedule_cache = schedule_data
+        _schedule_mtime_ns = mtime_ns
+    return _schedule_cache
+
+
+def _save_schedule(schedule_data: dict) -> None:
+    """Write the schedule to schedule.json and make it the in-memory copy.
+
+    Skips the write when nothing changed, e.g. re-submitting the same trigger time.
+    """
+    global _schedule_cache, _schedule_mtime_ns
+    if schedule_data == _schedule_cache:
+        return
+    # Compact unless SCHEDULE_DEBUG is set - the file is only read back by the server
+    _write_json_atomic("schedule.json", schedule_data, indent=bool(os.getenv("SCHEDULE_DEBUG")))
+    _schedule_cache = schedule_data
+    _schedule_mtime_ns = os.stat("schedule.json").st_mtime_ns
+
+
+# Fast path for the format the UI and schedule.json use: "2026-01-23T07:00:00+08:00" (offset optional)
+TRIGGER_TIME_RE = re.compile(r"(\d{4})-(\d{2})-(\d{2})T(\d{2}):(\d{2}):(\d{2})(?:\+08:00)?")
+
+
+def _parse_trigger_time(trigger_time_str: str) -> datetime:
+    """Parse an ISO 8601 trigger time, treating a missing UTC offset as Taiwan Time.
+
+    Trigger times are compared against datetime.now(TAIPEI_TZ); a naive value
+    would raise TypeError on comparison. Anything TRIGGER_TIME_RE does not
+    match (other offsets, fractional seconds, ...) goes through fromisoformat.
+    """
+    match = TRIGGER_TIME_RE.fullmatch(trigger_time_str)
+    if match:
+        return datetime(*map(int, match.groups()), tzinfo=TAIPEI_TZ)
+    trigger_time = datetime.fromisoformat(trigger_time_str)
+    if trigger_time.tzinfo is None:
+        trigger_time = trigger_time.replace(tzinfo=TAIPEI_TZ)
+    return trigger_time
+
+
+def _validate_schedule(schedule_data) -> None:
+    """Raise ValueError unless every task maps to {"enable": bool, "trigger_time": str}."""
+    if not isinstance(schedule_data, dict):
+        raise ValueError("schedule.json must contain a JSON object")
+    for task_name, task_config in schedule_data.items():
+        if not isinstance(task_config, dict):
+            raise ValueError(f"task '{task_name}' must be an object")
+        if not isinstance(task_config.get("enable"), bool):
+            raise ValueError(f"task '{task_name}' needs a boolean 'enable'")
+        if not isinstance(task_config.get("trigger_time"), str):
+            raise ValueError(f"task '{task_name}' needs an ISO 8601 'trigger_time' string")
+
+
 @app.get("/api/schedule-status")
 async def get_schedule_status():
     """Check if the chained execution is scheduled.
@@ -1292,21 +1778,18 @@ async def get_schedule_status():
               All three will be true/false together (they run as a chain).
     """
     try:
-        with open("schedule.json", "r") as f:
-            schedule_data = json.load(f)
+        schedule_data = _load_schedule()
 
-        now = datetime.now(ZoneInfo("Asia/Taipei"))
+        now = datetime.now(TAIPEI_TZ)
 
         # Check if the chain is scheduled using the Update task's trigger_time
         # When the chain is scheduled, all three tasks run together
         chain_scheduled = False
         update_config = schedule_data.get("Update", {})
         if update_config.get("enable", False):
-            trigger_time_str = update_config.get("trigger_time")
-            if trigger_time_str:
-                trigger_time = datetime.fromisoformat(trigger_time_str)
-                if trigger_time > now:
-                    chain_scheduled = True
+            trigger_time = update_config.get("trigger_time")
+            if trigger_time and trigger_time > now:
+                chain_scheduled = True
 
         # All three tasks share the same scheduled status (they run as a chain)
         return {
@@ -1327,23 +1810,28 @@ async def update_schedule(request: ScheduleRequest):
     """
     try:
         # Parse the input trigger time
-        trigger_time = datetime.fromisoformat(request.trigger_time)
+        trigger_time = _parse_trigger_time(request.trigger_time)
 
-        # Read existing schedule.json to preserve enable flag
-        with open("schedule.json", "r") as f:
-            schedule_data = json.load(f)
+        # Copy the current schedule to preserve enable flag
+        schedule_data = copy.deepcopy(_load_schedule())
 
         # Update the trigger time
-        schedule_data["Update"]["trigger_time"] = trigger_time.isoformat()
+        schedule_data["Update"]["trigger_time"] = trigger_time
 
-        # Write back to schedule.json
-        with open("schedule.json", "w") as f:
-            json.dump(schedule_data, f, indent=2)
+        # Write back to schedule.json (in a worker thread so the fsync doesn't block the loop)
+        await asyncio.to_thread(_save_schedule, schedule_data)
 
         logger.info(f"Schedule updated - Chain starts at: {trigger_time.isoformat()}")
 
-        # Re-setup scheduled tasks with new time
-        setup_scheduled_tasks()
+        # Move the pending chain job in place when possible; otherwise rebuild from
+        # schedule.json (disabled schedule, past time, or a queued missed-job run)
+        job = scheduler.get_job("chained_execution_scheduled")
+        if (job and not job.kwargs and schedule_data["Update"].get("enable", False)
+                and trigger_time > datetime.now(TAIPEI_TZ)):
+            job.reschedule(trigger=DateTrigger(run_date=trigger_time))
+            logger.info(f"Rescheduled chained execution for {trigger_time.isoformat()}")
+        else:
+            setup_scheduled_tasks()
 
         return {
             "success": True,
@@ -1386,13 +1874,13 @@ async def sse_events():
     - Manual button actions complete
     """
     async def event_generator():
-        client_queue = asyncio.Queue()
+        client_queue = asyncio.Queue(maxsize=SSE_QUEUE_MAXSIZE)
         sse_clients.add(client_queue)
         logger.info(f"SSE client connected. Total clients: {len(sse_clients)}")
 
         try:
             # Send initial connection event
-            yield "event: connected\ndata: {\"status\": \"connected\"}\n\n"
+            yield SSE_CONNECTED_FRAME
 
             # Keep connection alive and send events
             while True:
@@ -1401,8 +1889,12 @@ async def sse_events():
                     message = await asyncio.wait_for(client_queue.get(), timeout=30.0)
                     yield message
                 except asyncio.TimeoutError:
+                    # Dropped by broadcast_sse_event for falling behind: end the stream
+                    # (EventSource reconnects with a fresh queue)
+                    if client_queue not in sse_clients:
+                        break
                     # Send keepalive ping
-                    yield ": keepalive\n\n"
+                    yield SSE_KEEPALIVE_FRAME
         except asyncio.CancelledError:
             pass
         finally:
@@ -1422,52 +1914,48 @@ async def sse_events():
 
 @app.get("/favicon.ico")
 async def favicon():
-    from fastapi.responses import Response
     return Response(status_code=204)
 
+# Request headers never written to the logs (ASGI header names are already lowercase)
+SENSITIVE_HEADERS = frozenset({'authorization', 'cookie', 'x-api-key'})
+
 @app.middleware("http")
 async def log_requests(request: Request, call_next):
-    request_id = str(uuid.uuid4())
+    request_id = uuid.uuid4().hex
     request.state.request_id = request_id
+    # One adapter per request carries request_id into every record, instead of an extra dict per call
+    log = request.state.log = logging.LoggerAdapter(logger, {'request_id': request_id})
 
-    # Extract client information
-    client_ip = request.client.host if request.client else "unknown"
-    user_agent = request.headers.get("user-agent", "unknown")
-    content_type = request.headers.get("content-type", "unknown")
+    log.info("Incoming request: %s %s", request.method, request.url.path)
 
-    logger.info(
-        f"Incoming request: {request.method} {request.url.path}",
-        extra={'request_id': request_id}
-    )
+    # Request details and headers are DEBUG-only; skip building them otherwise
+    if logger.isEnabledFor(logging.DEBUG):
+        # Extract client information
+        client_ip = request.client.host if request.client else "unknown"
+        user_agent = request.headers.get("user-agent", "unknown")
+        content_type = request.headers.get("content-type", "unknown")
 
-    logger.debug(
-        f"Request details - Client IP: {client_ip} - User-Agent: {user_agent} - "
-        f"Content-Type: {content_type} - Query params: {dict(request.query_params)}",
-        extra={'request_id': request_id}
-    )
+        log.debug(
+            "Request details - Client IP: %s - User-Agent: %s - Content-Type: %s - Query params: %s",
+            client_ip, user_agent, content_type, dict(request.query_params)
+        )
 
-    # Log request headers (excluding sensitive ones)
-    safe_headers = {k: v for k, v in request.headers.items()
-                   if k.lower() not in ['authorization', 'cookie', 'x-api-key']}
-    logger.debug(
-        f"Request headers: {json.dumps(safe_headers)}",
-        extra={'request_id': request_id}
-    )
+        # Log request headers (excluding sensitive ones)
+        safe_headers = {k: v for k, v in request.headers.items() if k not in SENSITIVE_HEADERS}
+        log.debug("Request headers: %s", orjson.dumps(safe_headers).decode())
 
-    start_time = time.time()
+    start_time = time.perf_counter()
     response = await call_next(request)
-    process_time = time.time() - start_time
+    process_time = time.perf_counter() - start_time
 
-    logger.info(
-        f"Request completed: {request.method} {request.url.path} - "
-        f"Status: {response.status_code} - Duration: {process_time:.3f}s",
-        extra={'request_id': request_id}
+    log.info(
+        "Request completed: %s %s - Status: %s - Duration: %.3fs",
+        request.method, request.url.path, response.status_code, process_time
     )
 
-    logger.debug(
-        f"Response details - Status: {response.status_code} - "
-        f"Content-Type: {response.headers.get('content-type', 'unknown')}",
-        extra={'request_id': request_id}
+    log.debug(
+        "Response details - Status: %s - Content-Type: %s",
+        response.status_code, response.headers.get('content-type', 'unknown')
     )
 
     response.headers["X-Request-ID"] = request_id
@@ -1477,42 +1965,36 @@ async def log_requests(request: Request, call_next):
 
 @app.get("/hello/{input}")
 async def hello(input: str, request: Request):
-    request_id = getattr(request.state, 'request_id', 'N/A')
+    log = getattr(request.state, 'log', logger)
 
-    logger.info(
-        f"Hello endpoint called with input: {input}",
-        extra={'request_id': request_id}
-    )
+    log.info("Hello endpoint called with input: %s", input)
 
-    logger.debug(
-        f"Processing hello request - Input length: {len(input)} chars",
-        extra={'request_id': request_id}
-    )
+    log.debug("Processing hello request - Input length: %d chars", len(input))
 
     response_data = {"message": f"Hello, World {input}"}
 
-    logger.debug(
-        f"Returning hello response: {json.dumps(response_data)}",
-        extra={'request_id': request_id}
-    )
+    log.debug("Returning hello response: %s", response_data)
 
     return response_data
 
+# Exception types that get extra context in chat error logs (timeouts are checked first,
+# since APITimeoutError is itself an APIError)
+CHAT_TIMEOUT_ERRORS = (APITimeoutError, httpx.TimeoutException, TimeoutError)
+CHAT_API_ERRORS = (APIError,)
+
+# CHAT_DEBUG_PRINT=1 echoes each chat exchange to stdout; the logger already records it
+CHAT_DEBUG_PRINT = os.getenv("CHAT_DEBUG_PRINT") == "1"
+
 @app.post("/chat")
 async def chat(chat_request: ChatRequest, request: Request):
-    request_id = getattr(request.state, 'request_id', 'N/A')
+    log = getattr(request.state, 'log', logger)
 
-    logger.info(
-        f"Chat request received - Message length: {len(chat_request.user_message)} chars",
-        extra={'request_id': request_id}
-    )
+    log.info("Chat request received - Message length: %d chars", len(chat_request.user_message))
 
     # Log message preview (first 100 chars)
-    message_preview = chat_request.user_message[:100] + "..." if len(chat_request.user_message) > 100 else chat_request.user_message
-    logger.debug(
-        f"User message preview: {message_preview}",
-        extra={'request_id': request_id}
-    )
+    if logger.isEnabledFor(logging.DEBUG):
+        message_preview = chat_request.user_message[:100] + "..." if len(chat_request.user_message) > 100 else chat_request.user_message
+        log.debug("User message preview: %s", message_preview)
 
     try:
         # Initialize conversation history
@@ -1526,23 +2008,17 @@ async def chat(chat_request: ChatRequest, request: Request):
             "base_url": str(client.base_url),
             "messages_count": len(messages)
         }
-        logger.info(
-            f"Calling supermind-agent-v1 API - Config: {json.dumps(api_config)}",
-            extra={'request_id': request_id}
-        )
+        log.info("Calling supermind-agent-v1 API - Config: %s", api_config)
 
-        api_start_time = time.time()
+        api_start_time = time.perf_counter()
         # supermind-agent-v1 has built-in web search - no tools parameter needed
-        response = client.chat.completions.create(
+        response = await client.chat.completions.create(
             model="supermind-agent-v1",
             messages=messages
         )
-        api_duration = time.time() - api_start_time
+        api_duration = time.perf_counter() - api_start_time
 
-        logger.debug(
-            f"supermind-agent-v1 API call completed - Duration: {api_duration:.3f}s",
-            extra={'request_id': request_id}
-        )
+        log.debug("supermind-agent-v1 API call completed - Duration: %.3fs", api_duration)
 
         # Extract response details
         message = response.choices[0].message
@@ -1556,24 +2032,15 @@ async def chat(chat_request: ChatRequest, request: Request):
                 "completion_tokens": response.usage.completion_tokens,
                 "total_tokens": response.usage.total_tokens
             }
-            logger.info(
-                f"Token usage - {json.dumps(token_details)}",
-                extra={'request_id': request_id}
-            )
+            log.info("Token usage - %s", token_details)
 
-        print(f"[Agent] Final Answer: '{final_response}'")
-        logger.info(
-            f"[Agent] Final Answer: '{final_response}'",
-            extra={'request_id': request_id}
-        )
+        log.info("[Agent] Final Answer: '%s'", final_response)
 
-        logger.info(
-            f"supermind-agent-v1 response received - Duration: {api_duration:.3f}s - "
-            f"Response length: {len(final_response)} chars - "
-            f"Model: {response.model} - "
-            f"Finish reason: {finish_reason} - "
-            f"Tokens used: {response.usage.total_tokens if hasattr(response, 'usage') else 'N/A'}",
-            extra={'request_id': request_id}
+        log.info(
+            "supermind-agent-v1 response received - Duration: %.3fs - Response length: %d chars - "
+            "Model: %s - Finish reason: %s - Tokens used: %s",
+            api_duration, len(final_response), response.model, finish_reason,
+            response.usage.total_tokens if hasattr(response, 'usage') else 'N/A'
         )
 
         result = {
@@ -1581,24 +2048,21 @@ async def chat(chat_request: ChatRequest, request: Request):
             "finish_reason": finish_reason
         }
 
-        logger.debug(
-            f"Returning chat response - Size: {len(json.dumps(result))} bytes",
-            extra={'request_id': request_id}
-        )
+        # Serialize once: the same bytes are logged for size and returned as the body
+        payload = orjson.dumps(result)
+        log.debug("Returning chat response - Size: %d bytes", len(payload))
 
-        # Print the user message and response
-        print("\n" + "=" * 80)
-        print(f"USER: {chat_request.user_message}")
-        print(f"RESPONSE: {final_response}")
-        print("=" * 80 + "\n")
+        # Print the user message and response as a single stdout write
+        if CHAT_DEBUG_PRINT:
+            sys.stdout.write(f"\n{BANNER_WIDE}\nUSER: {chat_request.user_message}\nRESPONSE: {final_response}\n{BANNER_WIDE}\n\n")
 
         # Log the message
-        logger.info(
-            f"Chat completed - User: {chat_request.user_message[:100]}... Response: {final_response[:100]}...",
-            extra={'request_id': request_id}
+        log.info(
+            "Chat completed - User: %s... Response: %s...",
+            chat_request.user_message[:100], final_response[:100]
         )
 
-        return result
+        return Response(content=payload, media_type="application/json")
 
     except Exception as e:
         error_details = {
@@ -1607,28 +2071,15 @@ async def chat(chat_request: ChatRequest, request: Request):
             "user_message_length": len(chat_request.user_message)
         }
 
-        logger.error(
-            f"Error during chat processing: {json.dumps(error_details)}",
-            extra={'request_id': request_id}
-        )
+        log.error("Error during chat processing: %s", error_details)
 
-        logger.error(
-            f"Full error traceback for {type(e).__name__}",
-            extra={'request_id': request_id},
-            exc_info=True
-        )
+        log.error("Full error traceback for %s", type(e).__name__, exc_info=True)
 
         # Log additional context for specific error types
-        if "timeout" in str(e).lower():
-            logger.error(
-                f"Timeout error detected - API call may have taken too long",
-                extra={'request_id': request_id}
-            )
-        elif "api" in str(e).lower() or "key" in str(e).lower():
-            logger.error(
-                f"API/Authentication error detected - Check API key and configuration",
-                extra={'request_id': request_id}
-            )
+        if isinstance(e, CHAT_TIMEOUT_ERRORS):
+            log.error("Timeout error detected - API call may have taken too long")
+        elif isinstance(e, CHAT_API_ERRORS):
+            log.error("API/Authentication error detected - Check API key and configuration")
 
         raise
 
@@ -1637,107 +2088,136 @@ async def chat(chat_request: ChatRequest, request: Request):
 # Scheduled Task Functions
 # ============================================================================
 
+def _log_boundary(title: str) -> None:
+    """Log a scheduled-task boundary: the title between two BANNER lines, as one record."""
+    # stacklevel=2 attributes the record to the calling task, not this helper
+    logger.info("%s\n%s\n%s", BANNER, title, BANNER, stacklevel=2)
+
+
 async def scheduled_update_email():
     """Wrapper for scheduled Update Email execution with logging."""
-    logger.info("=" * 60)
-    logger.info("SCHEDULED TASK: Update Email - Starting")
-    logger.info("=" * 60)
+    _log_boundary("SCHEDULED TASK: Update Email - Starting")
 
     try:
         result = await _perform_update_email()
-        logger.info(f"SCHEDULED TASK: Update Email - Completed successfully: {result}")
+        logger.info("SCHEDULED TASK: Update Email - Completed successfully: %s", result)
         # Notify frontend that email content was updated
         await broadcast_sse_event("email-updated", result)
     except Exception as e:
-        logger.error(f"SCHEDULED TASK: Update Email - Failed with error: {e}")
+        logger.error("SCHEDULED TASK: Update Email - Failed with error: %s", e)
         raise
 
 
 async def scheduled_send_email():
     """Wrapper for scheduled Send Email execution with logging."""
-    logger.info("=" * 60)
-    logger.info("SCHEDULED TASK: Send Email - Starting")
-    logger.info("=" * 60)
+    _log_boundary("SCHEDULED TASK: Send Email - Starting")
 
     try:
         result = await _perform_send_email()
-        logger.info(f"SCHEDULED TASK: Send Email - Completed successfully: {result}")
+        logger.info("SCHEDULED TASK: Send Email - Completed successfully: %s", result)
         # Notify frontend that email was sent
         await broadcast_sse_event("email-sent", result)
     except Exception as e:
-        logger.error(f"SCHEDULED TASK: Send Email - Failed with error: {e}")
+        logger.error("SCHEDULED TASK: Send Email - Failed with error: %s", e)
         raise
 
 
 async def scheduled_update_stocks():
     """Wrapper for scheduled Update (stock prices) execution with logging."""
-    logger.info("=" * 60)
-    logger.info("SCHEDULED TASK: Update - Starting")
-    logger.info("=" * 60)
+    _log_boundary("SCHEDULED TASK: Update - Starting")
 
     try:
-        result = _perform_update_stocks()
-        logger.info(f"SCHEDULED TASK: Update - Completed successfully: {result}")
+        result = await _perform_update_stocks()
+        logger.info("SCHEDULED TASK: Update - Completed successfully: %s", result)
         # Notify frontend that stocks were updated
         await broadcast_sse_event("stocks-updated", result)
     except Exception as e:
-        logger.error(f"SCHEDULED TASK: Update - Failed with error: {e}")
+        logger.error("SCHEDULED TASK: Update - Failed with error: %s", e)
         raise
 
 
-async def scheduled_chain_execution():
-    """Master orchestrator that chains Update Tracker -> Update News -> Send Email.
+# Chain steps in run order: (display name, core function, SSE event broadcast on success)
+CHAIN_STEPS = (
+    ("Update Tracker", _perform_update_stocks, "stocks-updated"),
+    ("Update News", _perform_update_email, "email-updated"),
+    ("Send Email", _perform_send_email, "email-sent"),
+)
+CHAIN_STEP_DELAY_SECONDS = 10
 
-    Each task is executed sequentially with 5-second delays between them.
-    If one task fails, the chain continues to the next task.
-    """
-    logger.info("=" * 60)
-    logger.info("SCHEDULED CHAIN: Starting chained execution")
-    logger.info("=" * 60)
+# Window for running missed jobs on startup
+MISSED_JOB_WINDOW_HOURS = 24
 
-    # Task 1: Update Tracker
-    logger.info("SCHEDULED CHAIN: Task 1/3 - Update Tracker - Starting")
-    try:
-        result = _perform_update_stocks()
-        logger.info(f"SCHEDULED CHAIN: Task 1/3 - Update Tracker - Completed: {result}")
-        await broadcast_sse_event("stocks-updated", result)
-    except Exception as e:
-        logger.error(f"SCHEDULED CHAIN: Task 1/3 - Update Tracker - Failed: {e}")
+# Job IDs cleared before rescheduling: the old individual jobs plus the chained job
+SCHEDULED_JOB_IDS = (
+    "update_stocks_scheduled",
+    "update_email_scheduled",
+    "send_email_scheduled",
+    "chained_execution_scheduled",
+)
 
-    logger.info("SCHEDULED CHAIN: Waiting 10 seconds before next task...")
-    await asyncio.sleep(10)
 
-    # Task 2: Update News
-    logger.info("SCHEDULED CHAIN: Task 2/3 - Update News - Starting")
-    try:
-        result = await _perform_update_email()
-        logger.info(f"SCHEDULED CHAIN: Task 2/3 - Update News - Completed: {result}")
-        await broadcast_sse_event("email-updated", result)
-    except Exception as e:
-        logger.error(f"SCHEDULED CHAIN: Task 2/3 - Update News - Failed: {e}")
+def _disable_schedule():
+    """Set Update.enable to false in schedule.json so a finished run is not repeated on restart."""
+    schedule_data = copy.deepcopy(_load_schedule())
+    schedule_data["Update"]["enable"] = False
+    _save_schedule(schedule_data)
 
-    logger.info("SCHEDULED CHAIN: Waiting 10 seconds before next task...")
-    await asyncio.sleep(10)
 
-    # Task 3: Send Email
-    logger.info("SCHEDULED CHAIN: Task 3/3 - Send Email - Starting")
-    try:
-        result = await _perform_send_email()
-        logger.info(f"SCHEDULED CHAIN: Task 3/3 - Send Email - Completed: {result}")
-        await broadcast_sse_event("email-sent", result)
-    except Exception as e:
-        logger.error(f"SCHEDULED CHAIN: Task 3/3 - Send Email - Failed: {e}")
+async def scheduled_chain_execution(disable_schedule_on_success: bool = False):
+    """Master orchestrator that chains Update Tracker -> Update News -> Send Email.
+
+    Each task in CHAIN_STEPS is executed sequentially with 10-second delays between them.
+    If one task fails, the chain continues to the next task.
+
+    Args:
+        disable_schedule_on_success: Disable the schedule once the email has been
+            sent (used for missed-job runs). Sending is the step that can't be
+            repeated safely, so a run whose Send Email step failed leaves the
+            schedule enabled for the next restart within the missed job window,
+            while a run that sent the email disables it even if an earlier task
+            failed.
+    """
+    _log_boundary("SCHEDULED CHAIN: Starting chained execution")
 
-    logger.info("=" * 60)
-    logger.info("SCHEDULED CHAIN: All tasks completed")
-    logger.info("=" * 60)
+    total = len(CHAIN_STEPS)
+    failed = 0
+    email_sent = False
+    for index, (name, perform, event_type) in enumerate(CHAIN_STEPS, start=1):
+        if index > 1:
+            logger.info("SCHEDULED CHAIN: Waiting %d seconds before next task...", CHAIN_STEP_DELAY_SECONDS)
+            await asyncio.sleep(CHAIN_STEP_DELAY_SECONDS)
+
+        logger.info("SCHEDULED CHAIN: Task %d/%d - %s - Starting", index, total, name)
+        try:
+            result = await perform()
+            logger.info("SCHEDULED CHAIN: Task %d/%d - %s - Completed: %s", index, total, name, result)
+            await broadcast_sse_event(event_type, result)
+            if perform is _perform_send_email:
+                email_sent = True
+        except Exception as e:
+            failed += 1
+            logger.error("SCHEDULED CHAIN: Task %d/%d - %s - Failed: %s", index, total, name, e)
+
+    _log_boundary("SCHEDULED CHAIN: All tasks completed")
+
+    if disable_schedule_on_success:
+        if not email_sent:
+            logger.warning("SCHEDULED CHAIN: Send Email failed - leaving schedule enabled for retry on restart")
+        else:
+            if failed:
+                logger.warning("SCHEDULED CHAIN: %d/%d tasks failed but the email was sent - disabling schedule anyway", failed, total)
+            try:
+                await asyncio.to_thread(_disable_schedule)
+                logger.info("Disabled schedule after missed job completed to prevent duplicate runs")
+            except Exception as e:
+                logger.error("Failed to update schedule.json: %s", e)
 
 
 def setup_scheduled_tasks():
     """Read schedule.json and schedule a chained job for all tasks.
 
     This function schedules a single chained job that executes:
-    Update Tracker -> (5s delay) -> Update News -> (5s delay) -> Send Email
+    Update Tracker -> (10s delay) -> Update News -> (10s delay) -> Send Email
 
     The chain starts at the "Update" task's trigger_time. The other task times
     in schedule.json are ignored since tasks now run sequentially.
@@ -1745,44 +2225,42 @@ def setup_scheduled_tasks():
     If the trigger time has passed but is within the MISSED_JOB_WINDOW (24 hours),
     the job will be scheduled to run immediately to catch up on missed executions.
     """
-    logger.info("Setting up scheduled tasks from schedule.json...")
-
-    # Configurable window for running missed jobs (24 hours)
-    MISSED_JOB_WINDOW_HOURS = 24
+    info, warning, error = logger.info, logger.warning, logger.error
+    info("Setting up scheduled tasks from schedule.json...")
 
     # Remove all existing scheduled jobs to allow clean rescheduling
-    # Include both old individual job IDs and new chained job ID for backward compatibility
-    job_ids = [
-        "update_stocks_scheduled",
-        "update_email_scheduled",
-        "send_email_scheduled",
-        "chained_execution_scheduled"
-    ]
-    for job_id in job_ids:
-        existing_job = scheduler.get_job(job_id)
+    get_job = scheduler.get_job
+    for job_id in SCHEDULED_JOB_IDS:
+        existing_job = get_job(job_id)
         if existing_job:
-            scheduler.remove_job(job_id)
-            logger.info(f"Removed existing scheduled job: {job_id}")
+            existing_job.remove()
+            info("Removed existing scheduled job: %s", job_id)
 
+    # STRICT_SCHEDULE=1 turns a missing or malformed schedule.json into a startup failure
+    strict = os.getenv("STRICT_SCHEDULE") == "1"
     try:
-        with open("schedule.json", "r") as f:
-            schedule_data = json.load(f)
+        schedule_data = _load_schedule()
     except FileNotFoundError:
-        logger.warning("schedule.json not found - no scheduled tasks will be configured")
+        warning("schedule.json not found - no scheduled tasks will be configured")
+        if strict:
+            raise
         return
-    except json.JSONDecodeError as e:
-        logger.error(f"Failed to parse schedule.json: {e}")
+    except ValueError as e:
+        # Invalid JSON (orjson.JSONDecodeError), unparseable trigger_time or wrong shape
+        error("Failed to parse schedule.json: %s", e)
+        if strict:
+            raise
         return
 
-    now = datetime.now(ZoneInfo("Asia/Taipei"))
+    now = datetime.now(TAIPEI_TZ)
 
     # Use the "Update" task's trigger_time as the chain start time
-    # The chain will run all three tasks sequentially with 5-second delays
+    # The chain will run all three tasks sequentially with 10-second delays
     update_config = schedule_data.get("Update", {})
     if update_config.get("enable", False):
-        trigger_time_str = update_config.get("trigger_time")
-        if trigger_time_str:
-            trigger_time = datetime.fromisoformat(trigger_time_str)
+        trigger_time = update_config.get("trigger_time")
+        if trigger_time:
+            trigger_time_str = trigger_time.isoformat()
             if trigger_time > now:
                 # Future job: schedule normally
                 scheduler.add_job(
@@ -1791,7 +2269,7 @@ def setup_scheduled_tasks():
                     id="chained_execution_scheduled",
                     replace_existing=True
                 )
-                logger.info(f"Scheduled chained execution (Update Tracker -> Update News -> Send Email) for {trigger_time_str}")
+                info("Scheduled chained execution (Update Tracker -> Update News -> Send Email) for %s", trigger_time_str)
             else:
                 # Past job: check if within missed job window
                 time_since_trigger = now - trigger_time
@@ -1800,82 +2278,80 @@ def setup_scheduled_tasks():
                 if hours_since_trigger <= MISSED_JOB_WINDOW_HOURS:
                     # Missed job within window: run immediately (10 second delay to allow startup to complete)
                     run_time = now + timedelta(seconds=10)
+                    # The chain disables the schedule itself once the email is sent, so a run
+                    # that fails or is interrupted before sending is retried on the next restart
                     scheduler.add_job(
                         scheduled_chain_execution,
                         trigger=DateTrigger(run_date=run_time),
+                        kwargs={"disable_schedule_on_success": True},
                         id="chained_execution_scheduled",
                         replace_existing=True
                     )
-                    logger.warning(f"MISSED JOB DETECTED: Trigger time {trigger_time_str} passed {hours_since_trigger:.1f} hours ago")
-                    logger.info(f"Scheduling missed job to run immediately (in 10 seconds)")
-
-                    # Disable the schedule to prevent re-running on next restart
-                    schedule_data["Update"]["enable"] = False
-                    try:
-                        with open("schedule.json", "w") as f:
-                            json.dump(schedule_data, f, indent=2)
-                        logger.info("Disabled schedule after detecting missed job to prevent duplicate runs")
-                    except Exception as e:
-                        logger.error(f"Failed to update schedule.json: {e}")
+                    warning("MISSED JOB DETECTED: Trigger time %s passed %.1f hours ago", trigger_time_str, hours_since_trigger)
+                    info("Scheduling missed job to run immediately (in 10 seconds)")
                 else:
                     # Missed job too old: skip it
-                    logger.warning(f"Skipping chained execution - trigger time {trigger_time_str} passed {hours_since_trigger:.1f} hours ago (exceeds {MISSED_JOB_WINDOW_HOURS}h window)")
+                    warning("Skipping chained execution - trigger time %s passed %.1f hours ago (exceeds %dh window)", trigger_time_str, hours_since_trigger, MISSED_JOB_WINDOW_HOURS)
     else:
-        logger.info("Chained execution is disabled (Update task is disabled in schedule.json)")
+        info("Chained execution is disabled (Update task is disabled in schedule.json)")
 
     # Log summary of all scheduled jobs
     scheduled_jobs = scheduler.get_jobs()
     if scheduled_jobs:
-        logger.info(f"Total scheduled jobs: {len(scheduled_jobs)}")
+        info("Total scheduled jobs: %d", len(scheduled_jobs))
         for job in scheduled_jobs:
-            logger.info(f"  - Job '{job.id}' scheduled for {job.next_run_time}")
+            # Jobs added before scheduler.start() are still pending and have no
+            # next_run_time yet; every job here uses a DateTrigger
+            info("  - Job '%s' scheduled for %s", job.id, job.trigger.run_date)
     else:
-        logger.info("No jobs currently scheduled")
+        info("No jobs currently scheduled")
 
 
 @app.on_event("startup")
 async def startup_event():
-    logger.info("=" * 80)
-    logger.info("Application starting up - VERSION 2026.01.25.v2 (with Go button)")
-    logger.info("=" * 80)
-
-    # Log environment details
-    logger.info(f"Python version: {sys.version}")
-    logger.info(f"Working directory: {os.getcwd()}")
-    logger.info(f"Process ID: {os.getpid()}")
-
-    # Log API configuration
-    logger.info(f"OpenAI base URL: {client.base_url}")
+    # The banner goes out as one multi-line record rather than a logging call per line
     api_key = os.getenv('SUPER_MIND_API_KEY')
-    if api_key:
-        logger.info(f"API key configured: Yes (length: {len(api_key)} chars, starts with: {api_key[:8]}...)")
-    else:
+    logger.info("\n".join((
+        BANNER_WIDE,
+        "Application starting up - VERSION 2026.01.25.v2 (with Go button)",
+        BANNER_WIDE,
+        # Environment details
+        f"Python version: {sys.version}",
+        f"Working directory: {os.getcwd()}",
+        f"Process ID: {os.getpid()}",
+        # API configuration
+        f"OpenAI base URL: {client.base_url}",
+        f"API key configured: Yes (length: {len(api_key)} chars, starts with: {api_key[:8]}...)" if api_key
+        else "API key configured: No",
+        # Logging configuration
+        f"Logging level: {logging.getLogger().level}",
+        "Log file: app.log",
+        # FastAPI configuration
+        f"FastAPI version: {FASTAPI_VERSION}",
+    )))
+    if not api_key:
         logger.warning("API key configured: No - API calls will fail!")
 
-    # Log logging configuration
-    logger.info(f"Logging level: {logging.getLogger().level}")
-    logger.info(f"Log file: app.log")
-
-    # Log FastAPI configuration
-    logger.info(f"FastAPI version: {FastAPI.__version__ if hasattr(FastAPI, '__version__') else 'unknown'}")
+    # Shared HTTP client so outbound requests reuse pooled keep-alive connections
+    app.state.http_client = httpx.AsyncClient(
+        timeout=httpx.Timeout(10.0),
+        limits=httpx.Limits(max_keepalive_connections=10)
+    )
 
     # Setup and start APScheduler for scheduled tasks
     setup_scheduled_tasks()
     scheduler.start()
-    logger.info("APScheduler started")
-
-    logger.info("Application startup completed successfully")
-    logger.info("=" * 80)
+    logger.info("APScheduler started\nApplication startup completed successfully\n%s", BANNER_WIDE)
 
 @app.on_event("shutdown")
 async def shutdown_event():
-    logger.info("=" * 80)
-    logger.info("Application shutting down")
-    logger.info(f"Shutdown time: {datetime.now().isoformat()}")
+    logger.info("%s\nApplication shutting down\nShutdown time: %s", BANNER_WIDE, datetime.now().isoformat())
 
     # Shutdown APScheduler
     scheduler.shutdown(wait=False)
-    logger.info("APScheduler stopped")
 
-    logger.info("Cleanup completed")
-    logger.info("=" * 80)
+    # Close the shared HTTP client and the OpenAI client's connection pool
+    await app.state.http_client.aclose()
+    await client.close()
+
+    logger.info("APScheduler stopped\nHTTP clients closed\nCleanup completed\n%s", BANNER_WIDE)
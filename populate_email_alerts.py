@@ -1,7 +1,10 @@
-import json
+import orjson
 import os
+from concurrent.futures import ThreadPoolExecutor
 from openai import OpenAI
 
+from stock_utils import write_json_if_changed
+
 # Initialize OpenAI client for AI chat API
 client = OpenAI(
     api_key=os.getenv("SUPER_MIND_API_KEY"),
@@ -9,6 +12,22 @@ client = OpenAI(
 )
 
 
+# Max news requests in flight at once (keeps well under API rate limits)
+MAX_WORKERS = 8
+
+# Headlines from earlier runs, keyed by news_cache_key(); the news for a given
+# trading day and direction doesn't change, so re-runs skip the API call
+NEWS_CACHE_PATH = "news_alerts_cache.json"
+
+
+def news_cache_key(stock: dict) -> str | None:
+    """Return "SYMBOL:YYYY-MM-DD:up|dn" for a stock, or None if it has no price date."""
+    date = stock.get("date") or ""
+    if not date:
+        return None
+    return f"{stock['symbol']}:{date[:10]}:{'up' if stock['changePercent'] > 0 else 'dn'}"
+
+
 def get_stock_news(symbol: str, name: str, change_percent: float) -> str:
     """Fetch relevant news headlines for a stock using AI chat API."""
     direction = "increased" if change_percent > 0 else "decreased"
@@ -22,44 +41,77 @@ def get_stock_news(symbol: str, name: str, change_percent: float) -> str:
 
 
 # Read stockapp.json
-with open("stockapp.json", "r") as f:
-    stock_data = json.load(f)
+with open("stockapp.json", "rb") as f:
+    stock_data = orjson.loads(f.read())
 
-# Filter stocks where |changePercent| > 5 for dailyPriceChange
-filtered = []
+# One pass over the stocks: all of them go to needToDropUntilBuyPrice
+# (symbol, price, diff, date); those with |changePercent| > 5 are dailyPriceChange movers
+movers = []
+diff_to_buy = []
 for s in stock_data["stocks"]:
-    if abs(s["changePercent"]) > 5:
-        print(f"Fetching news for {s['symbol']}...")
-        news = get_stock_news(s["symbol"], s["name"], s["changePercent"])
-        filtered.append({
-            "symbol": s["symbol"],
-            "name": s["name"],
-            "price": s["price"],
-            "changePercent": s["changePercent"],
-            "date": s.get("date", ""),
-            "news": news
-        })
-
-# Get all stocks for needToDropUntilBuyPrice (symbol, price, diff, date)
-diff_to_buy = [
-    {
+    diff_to_buy.append({
         "symbol": s["symbol"],
         "price": s["price"],
         "diff": s.get("diff", 0),
         "date": s.get("date", "")
-    }
-    for s in stock_data["stocks"]
-]
+    })
+    if abs(s["changePercent"]) > 5:
+        movers.append(s)
+
+# Only the movers' dicts are needed from here on; drop the rest of the
+# document before the long network phase
+del stock_data
+
+
+# Load the news cache; a missing or corrupt file is an empty cache
+try:
+    with open(NEWS_CACHE_PATH, "rb") as f:
+        news_cache = orjson.loads(f.read())
+except (FileNotFoundError, orjson.JSONDecodeError):
+    news_cache = {}
+
+
+def fetch_news(s: dict) -> str:
+    cache_key = news_cache_key(s)
+    news = news_cache.get(cache_key) if cache_key else None
+    if news:
+        print(f"Using cached news for {s['symbol']} ({cache_key})")
+        return news
+    print(f"Fetching news for {s['symbol']}...")
+    return get_stock_news(s["symbol"], s["name"], s["changePercent"])
+
+
+# Fetch news for all movers concurrently; map() keeps results in stockapp.json order
+with ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
+    all_news = list(pool.map(fetch_news, movers))
+
+# Build dailyPriceChange and this run's cache entries in the same pass
+# (only this run's entries are kept so the cache doesn't grow without bound)
+current_news = {}
+filtered = []
+for s, news in zip(movers, all_news):
+    cache_key = news_cache_key(s)
+    if cache_key and news:
+        current_news[cache_key] = news
+    filtered.append({
+        "symbol": s["symbol"],
+        "name": s["name"],
+        "price": s["price"],
+        "changePercent": s["changePercent"],
+        "date": s.get("date", ""),
+        "news": news
+    })
+write_json_if_changed(NEWS_CACHE_PATH, current_news)
 
 # Read email.json, update both arrays, write back
-with open("email.json", "r") as f:
-    email_data = json.load(f)
+with open("email.json", "rb") as f:
+    email_data = orjson.loads(f.read())
 
 email_data["content"]["dailyPriceChange"] = filtered
 email_data["content"]["needToDropUntilBuyPrice"] = diff_to_buy
 
-with open("email.json", "w") as f:
-    json.dump(email_data, f, indent=2)
+# Skipped when email.json already holds exactly this content
+write_json_if_changed("email.json", email_data)
 
 print(f"Added {len(filtered)} stocks to dailyPriceChange")
 print(f"Added {len(diff_to_buy)} stocks to needToDropUntilBuyPrice")
@@ -0,0 +1,61 @@
+"""Helpers shared by main.py and the standalone scripts (update_zero_prices.py,
+populate_email_alerts.py), kept here because importing main.py starts the app."""
+import logging
+import os
+
+import orjson
+import yfinance as yf
+
+logger = logging.getLogger(__name__)
+
+
+def download_closes(symbols: list[str]) -> dict:
+    """Fetch 2-day closing prices for all symbols in one batched yf.download call.
+
+    Returns:
+        dict: symbol -> non-empty Close series; symbols missing from the batch
+              are left out so the caller can fall back to ticker.history()
+    """
+    try:
+        data = yf.download(symbols, period="2d", group_by="ticker", auto_adjust=True, threads=True, progress=False)
+    except Exception as e:
+        logger.warning(f"Batched yfinance download failed, falling back to per-symbol history: {e}")
+        return {}
+    if data is None or data.empty:
+        return {}
+
+    closes = {}
+    for symbol in symbols:
+        try:
+            frame = data[symbol] if data.columns.nlevels > 1 else data
+            close = frame["Close"].dropna()
+        except KeyError:
+            continue
+        if not close.empty:
+            closes[symbol] = close
+    return closes
+
+
+def write_json_if_changed(path: str, data) -> bool:
+    """Write data as 2-space-indented JSON, atomically, unless the file already holds exactly that.
+
+    The new content goes to a temp file that is fsynced and swapped in with
+    os.replace, so an interrupted run never leaves a truncated file.
+
+    Returns:
+        bool: True if the file was written
+    """
+    payload = orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE)
+    try:
+        with open(path, "rb") as f:
+            if f.read() == payload:
+                return False
+    except FileNotFoundError:
+        pass
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(payload)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    return True
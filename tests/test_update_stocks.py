@@ -0,0 +1,82 @@
+import asyncio
+import os
+import sys
+import tempfile
+import unittest
+
+import orjson
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("SUPER_MIND_API_KEY", "test")
+
+import main  # noqa: E402
+
+
+def stock(symbol: str, buy_price: float, price: float = 100.0) -> dict:
+    return {"symbol": symbol, "name": symbol.strip(), "price": price, "changePercent": 1.0,
+            "date": "2026-01-16T05:00:00+08:00", "buyPrice": buy_price, "diff": 0}
+
+
+class UpdateStocksTest(unittest.IsolatedAsyncioTestCase):
+    """PUT /api/stocks merges its edits and fetched prices into the current stockapp.json."""
+
+    def setUp(self):
+        self.cwd = os.getcwd()
+        self.tmp = tempfile.TemporaryDirectory()
+        os.chdir(self.tmp.name)
+        self.fetch_started = asyncio.Event()
+        self.release_fetch = asyncio.Event()
+        self.original_fetch = main._fetch_stock_quotes
+        main._fetch_stock_quotes = self.fake_fetch
+
+    def tearDown(self):
+        main._fetch_stock_quotes = self.original_fetch
+        os.chdir(self.cwd)
+        self.tmp.cleanup()
+
+    async def fake_fetch(self, targets):
+        self.fetch_started.set()
+        await self.release_fetch.wait()
+        for quote, symbol in targets:
+            quote["price"] = 200.0
+        return [True] * len(targets)
+
+    def write_stocks(self, stocks):
+        with open("stockapp.json", "wb") as f:
+            f.write(orjson.dumps({"search": "", "stocks": stocks}))
+
+    def read_stocks(self):
+        with open("stockapp.json", "rb") as f:
+            return orjson.loads(f.read())["stocks"]
+
+    def request(self, stocks):
+        return main.StocksUpdateRequest(stocks=[{k: s[k] for k in ("symbol", "name", "price", "changePercent", "date", "buyPrice")} for s in stocks])
+
+    async def test_autosave_during_fetch_is_kept(self):
+        # The stored symbol has surrounding whitespace; the request row is otherwise unchanged
+        self.write_stocks([stock(" TSLA ", 380.0), stock("META", 630.0)])
+        update = asyncio.create_task(main.update_stocks(self.request([stock("TSLA", 380.0), stock("META", 630.0)])))
+        await self.fetch_started.wait()
+
+        await main.autosave_stocks(self.request([stock("TSLA", 12345.0), stock("META", 630.0)]))
+        self.release_fetch.set()
+        await update
+
+        stocks = self.read_stocks()
+        self.assertEqual([s["buyPrice"] for s in stocks], [12345.0, 630.0])
+        self.assertEqual([s["price"] for s in stocks], [200.0, 200.0])
+
+    async def test_request_edits_are_applied(self):
+        self.write_stocks([stock("TSLA", 380.0), stock("META", 630.0)])
+        self.release_fetch.set()
+
+        result = await main.update_stocks(self.request([stock("tsla", 1.5), stock("MSFT", 600.0)]))
+
+        stocks = self.read_stocks()
+        self.assertEqual(stocks, result["stocks"])
+        self.assertEqual([(s["symbol"], s["buyPrice"], s["price"]) for s in stocks],
+                         [("TSLA", 1.5, 200.0), ("MSFT", 600.0, 200.0)])
+
+
+if __name__ == "__main__":
+    unittest.main()
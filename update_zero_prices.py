@@ -1,8 +1,15 @@
 import yfinance as yf
-import json
-from datetime import datetime
+import orjson
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta
 from zoneinfo import ZoneInfo
 
+from stock_utils import download_closes, write_json_if_changed
+
+# Taiwan Time, built once rather than per stock
+TAIPEI_TZ = ZoneInfo("Asia/Taipei")
+ONE_DAY = timedelta(days=1)
+
 
 def format_market_close_time(trading_date) -> str:
     """Convert trading date to market close time in Taiwan Time.
@@ -15,49 +22,76 @@ def format_market_close_time(trading_date) -> str:
     Returns:
         ISO 8601 formatted string like "2026-01-17T05:00:00+08:00"
     """
-    from datetime import timedelta
     trade_date = trading_date.date() if hasattr(trading_date, 'date') else trading_date
-    taiwan = ZoneInfo("Asia/Taipei")
     # Market closes at 4:00 PM Eastern Time = 5:00 AM next day Taiwan Time
-    next_day = trade_date + timedelta(days=1)
-    market_close = datetime(next_day.year, next_day.month, next_day.day, 5, 0, 0, tzinfo=taiwan)
+    next_day = trade_date + ONE_DAY
+    market_close = datetime(next_day.year, next_day.month, next_day.day, 5, 0, 0, tzinfo=TAIPEI_TZ)
     return market_close.isoformat()
 
+
+# Max per-symbol history fetches in flight when the batched download misses symbols
+MAX_WORKERS = 16
+
+
+def fetch_close(symbol: str):
+    """Fetch one symbol's 2-day Close series with ticker.history, without NaN rows."""
+    return yf.Ticker(symbol).history(period="2d")['Close'].dropna()
+
+
 # Read stockapp.json
-with open("stockapp.json", "r") as f:
-    data = json.load(f)
+with open("stockapp.json", "rb") as f:
+    data = orjson.loads(f.read())
+
+# Stocks with price=0.0, and their distinct symbols
+zero_stocks = [stock for stock in data["stocks"] if stock["price"] == 0.0]
+symbols = list(dict.fromkeys(stock["symbol"] for stock in zero_stocks))
+
+# One batched request for every symbol, then concurrent per-symbol fetches for any it missed
+closes = download_closes(symbols) if symbols else {}
+failed = set()
+missing = [symbol for symbol in symbols if symbol not in closes]
+if missing:
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
+        futures = {pool.submit(fetch_close, symbol): symbol for symbol in missing}
+        for future in as_completed(futures):
+            symbol = futures[future]
+            try:
+                closes[symbol] = future.result()
+            except Exception as e:
+                failed.add(symbol)
+                print(f"Error for {symbol}: {e}")
 
 # Update stocks with price=0.0
-for stock in data["stocks"]:
-    if stock["price"] == 0.0:
-        symbol = stock["symbol"]
-        try:
-            ticker = yf.Ticker(symbol)
-            history = ticker.history(period="2d")
-            if not history.empty:
-                stock["price"] = round(float(history['Close'].iloc[-1]), 2)
-                # Get the actual market close time in Eastern Time
-                trading_date = history.index[-1]
-                price_date = format_market_close_time(trading_date)
-                stock["date"] = price_date
-
-                # Calculate percentage change from previous day
-                if len(history) >= 2:
-                    current_close = float(history['Close'].iloc[-1])
-                    previous_close = float(history['Close'].iloc[-2])
-                    change_percent = ((current_close - previous_close) / previous_close) * 100
-                    stock["changePercent"] = round(change_percent, 2)
-                else:
-                    stock["changePercent"] = None
-
-                print(f"Updated {symbol}: ${stock['price']} (date: {price_date}, change: {stock.get('changePercent')}%)")
+for stock in zero_stocks:
+    symbol = stock["symbol"]
+    if symbol in failed:
+        continue
+    try:
+        close = closes[symbol]
+        if not close.empty:
+            stock["price"] = round(float(close.iloc[-1]), 2)
+            # Get the actual market close time in Eastern Time
+            trading_date = close.index[-1]
+            price_date = format_market_close_time(trading_date)
+            stock["date"] = price_date
+
+            # Calculate percentage change from previous day
+            if len(close) >= 2:
+                current_close = float(close.iloc[-1])
+                previous_close = float(close.iloc[-2])
+                change_percent = ((current_close - previous_close) / previous_close) * 100
+                stock["changePercent"] = round(change_percent, 2)
             else:
-                print(f"No price data for {symbol}")
-        except Exception as e:
-            print(f"Error for {symbol}: {e}")
+                stock["changePercent"] = None
 
-# Write back to stockapp.json
-with open("stockapp.json", "w") as f:
-    json.dump(data, f, indent=2)
+            print(f"Updated {symbol}: ${stock['price']} (date: {price_date}, change: {stock.get('changePercent')}%)")
+        else:
+            print(f"No price data for {symbol}")
+    except Exception as e:
+        print(f"Error for {symbol}: {e}")
 
-print("\nDone! Check stockapp.json for updated prices.")
+# Write back to stockapp.json (skipped when no price changed)
+if write_json_if_changed("stockapp.json", data):
+    print("\nDone! Check stockapp.json for updated prices.")
+else:
+    print("\nDone! No prices changed; stockapp.json left as is.")